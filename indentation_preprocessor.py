@@ -8,6 +8,13 @@ that can be parsed by a context-free grammar.
 from typing import List, Tuple
 
 
+# Line prefixes that mark comment-only lines
+COMMENT_PREFIXES = ('//', '/*')
+
+# Triple-quote delimiter for multiline strings
+TRIPLE_QUOTE = '"""'
+
+
 class IndentationPreprocessor:
     """Converts indentation to INDENT/DEDENT tokens."""
 
@@ -44,7 +51,7 @@ class IndentationPreprocessor:
             stripped = line.lstrip()
 
             # Count triple quotes to detect multiline string boundaries
-            triple_quote_count = line.count('"""')
+            triple_quote_count = line.count(TRIPLE_QUOTE)
 
             # Track if we were in a multiline string before processing this line
             was_in_multiline = in_multiline_string
@@ -74,12 +81,12 @@ class IndentationPreprocessor:
                 continue
 
             # Skip empty lines and lines with only whitespace
-            if not line.strip():
+            if not stripped:
                 processed_lines.append('')
                 continue
 
             # Skip comment-only lines (preserve them as-is)
-            if stripped.startswith('//') or stripped.startswith('/*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 processed_lines.append(line)
                 continue
 
@@ -18,7 +18,7 @@ Usage:
     processor = IDLProcessor(config)
 """
 
-from .config import Config, ValidationConfig, NamingConfig, CodegenConfig
+from .config import Config, ParserConfig, ValidationConfig, NamingConfig, CodegenConfig
 from .parser.ast_parser import ASTParser
 from .validator.validator import IDLValidator
 from .ast.types import (
@@ -40,6 +40,7 @@ __version__ = "0.1.0"
 __all__ = [
     "IDLProcessor",
     "Config",
+    "ParserConfig",
     "ParseResult",
     "ValidationResult",
     "ParseError",
@@ -79,18 +80,20 @@ class IDLProcessor:
         """
         return self.parser.parse_file(file_path)
 
-    def parse_string(self, content: str, file_path: str = "<string>") -> ParseResult:
+    def parse_string(self, content: str, file_path: str = "<string>",
+                     skip_preprocessing: bool = False) -> ParseResult:
         """
         Parse IDL content from a string.
 
         Args:
             content: IDL source code
             file_path: Virtual file path for error reporting
+            skip_preprocessing: Content is already indentation-preprocessed
 
         Returns:
             ParseResult with success status and any errors
         """
-        return self.parser.parse_string(content, file_path)
+        return self.parser.parse_string(content, file_path, skip_preprocessing)
 
     def parse_files(self, file_paths: List[str]) -> ParseResult:
         """
@@ -159,23 +162,19 @@ class IDLProcessor:
         # Parse all files
         return self.parse_files([str(f) for f in msg_files])
 
-    def process_string(self, content: str, file_path: str = "<string>") -> ValidationResult:
+    def validate(self, parse_result: ParseResult) -> ValidationResult:
         """
-        Parse and validate IDL content from a string.
+        Validate an already parsed result.
+
+        Lets callers that already hold a ParseResult run semantic validation
+        without parsing the same source a second time.
 
         Args:
-            content: IDL source code
-            file_path: Virtual file path for error reporting
+            parse_result: ParseResult from one of the parse_* methods
 
         Returns:
             ValidationResult with success status and any errors
-
-        Note:
-            Currently only performs parsing. Full validation will be
-            implemented in future version.
         """
-        parse_result = self.parse_string(content, file_path)
-
         # Convert ParseResult to ValidationResult
         validation_result = ValidationResult()
         validation_result.parsed_files = parse_result.files
@@ -193,9 +192,26 @@ class IDLProcessor:
             ))
 
         # Run semantic validation
-        validation_result = self.validator.validate(validation_result)
+        return self.validator.validate(validation_result)
 
-        return validation_result
+    def process_string(self, content: str, file_path: str = "<string>") -> ValidationResult:
+        """
+        Parse and validate IDL content from a string.
+
+        Args:
+            content: IDL source code
+            file_path: Virtual file path for error reporting
+
+        Returns:
+            ValidationResult with success status and any errors
+
+        Note:
+            Currently only performs parsing. Full validation will be
+            implemented in future version.
+        """
+        parse_result = self.parse_string(content, file_path)
+
+        return self.validate(parse_result)
 
     def process_file(self, file_path: str) -> ValidationResult:
         """
@@ -213,26 +229,7 @@ class IDLProcessor:
         """
         parse_result = self.parse_file(file_path)
 
-        # Convert ParseResult to ValidationResult
-        validation_result = ValidationResult()
-        validation_result.parsed_files = parse_result.files
-        validation_result.success = parse_result.success
-
-        # Convert ParseErrors to ValidationErrors
-        for error in parse_result.errors:
-            validation_result.add_error(ValidationError(
-                file_path=error.file_path,
-                line=error.line,
-                column=error.column,
-                message=error.message,
-                error_type=error.error_type,
-                severity="error"
-            ))
-
-        # Run semantic validation
-        validation_result = self.validator.validate(validation_result)
-
-        return validation_result
+        return self.validate(parse_result)
 
     def process_files(self, file_paths: List[str]) -> ValidationResult:
         """
@@ -246,26 +243,7 @@ class IDLProcessor:
         """
         parse_result = self.parse_files(file_paths)
 
-        # Convert ParseResult to ValidationResult
-        validation_result = ValidationResult()
-        validation_result.parsed_files = parse_result.files
-        validation_result.success = parse_result.success
-
-        # Convert ParseErrors to ValidationErrors
-        for error in parse_result.errors:
-            validation_result.add_error(ValidationError(
-                file_path=error.file_path,
-                line=error.line,
-                column=error.column,
-                message=error.message,
-                error_type=error.error_type,
-                severity="error"
-            ))
-
-        # Run semantic validation
-        validation_result = self.validator.validate(validation_result)
-
-        return validation_result
+        return self.validate(parse_result)
 
     def process_directory(self, directory: str, recursive: bool = True) -> ValidationResult:
         """
@@ -280,26 +258,7 @@ class IDLProcessor:
         """
         parse_result = self.parse_directory(directory, recursive)
 
-        # Convert ParseResult to ValidationResult
-        validation_result = ValidationResult()
-        validation_result.parsed_files = parse_result.files
-        validation_result.success = parse_result.success
-
-        # Convert ParseErrors to ValidationErrors
-        for error in parse_result.errors:
-            validation_result.add_error(ValidationError(
-                file_path=error.file_path,
-                line=error.line,
-                column=error.column,
-                message=error.message,
-                error_type=error.error_type,
-                severity="error"
-            ))
-
-        # Run semantic validation
-        validation_result = self.validator.validate(validation_result)
-
-        return validation_result
+        return self.validate(parse_result)
 
     def generate_python(self, result: ValidationResult, output_dir: str):
         """Generate Python code from validated AST."""
@@ -139,6 +139,9 @@ paths = [
     "common",
 ]
 
+[parser]
+algorithm = "lalr"
+
 [validation]
 enforce_field_numbering = false
 allow_negative_field_numbers = false
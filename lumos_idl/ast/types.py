@@ -4,13 +4,19 @@ AST type definitions for LumosInterface IDL.
 Defines data structures for parsed and validated AST nodes.
 """
 
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 from lark import Tree
 
 
-@dataclass
+# Slotted dataclasses (no per-instance __dict__) for the high-volume AST info
+# types; dataclass(slots=True) needs Python 3.10+, older versions keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class FieldInfo:
     """Information about a struct/interface field."""
     name: str
@@ -20,6 +26,7 @@ class FieldInfo:
     inline_attributes: Dict[str, Any] = field(default_factory=dict)
     indented_attributes: Dict[str, Any] = field(default_factory=dict)
     line_number: int = 0
+    file_path: Optional[Path] = None  # Set from the owning type during attribute validation
 
 
 @dataclass
@@ -30,7 +37,7 @@ class EnumMemberInfo:
     line_number: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TypeInfo:
     """Information about a defined type."""
     name: str                    # Simple name (e.g., "Position")
@@ -55,7 +62,7 @@ class ConstantInfo:
     line_number: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AliasInfo:
     """Information about a type alias."""
     name: str
@@ -135,6 +142,10 @@ class ValidationResult:
         elif error.severity == "warning":
             self.warnings.append(error)
 
+    def has_error(self, text: str) -> bool:
+        """Check whether any single error message contains text."""
+        return any(text in error.message for error in self.errors)
+
     def print_errors(self):
         """Print formatted errors and warnings."""
         if self.errors:
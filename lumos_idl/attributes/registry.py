@@ -4,12 +4,18 @@ Attribute schema registry for LumosInterface IDL.
 Manages attribute schemas and provides validation capabilities.
 """
 
+import functools
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Pattern, Union
 import yaml
 
 
+# libyaml-backed loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 @dataclass
 class ValidationResult:
     """Result of attribute validation."""
@@ -34,6 +40,43 @@ class AttributeSchema:
         self.struct_attributes = schema_dict.get('struct_attributes', {})
         self.enum_attributes = schema_dict.get('enum_attributes', {})
 
+        # Compiled regexes for every 'pattern' constraint, keyed by pattern string
+        self._patterns: Dict[str, Pattern] = {}
+        for specs in (self.field_attributes, self.struct_attributes, self.enum_attributes):
+            for spec in specs.values():
+                self._prepare_constraints(spec)
+
+    def _prepare_constraints(self, spec: Any):
+        """
+        Precompute the 'pattern' and 'enum' constraints in a spec and its nested specs.
+
+        The set form of an 'enum' list is stored next to it in the same
+        constraints dict, under '_enum_set'.
+
+        Args:
+            spec: Attribute, property or array item specification
+        """
+        if not isinstance(spec, dict):
+            return
+
+        constraints = spec.get('constraints', {})
+
+        pattern = constraints.get('pattern')
+        if isinstance(pattern, str) and pattern not in self._patterns:
+            self._patterns[pattern] = re.compile(pattern)
+
+        allowed = constraints.get('enum')
+        if isinstance(allowed, list):
+            try:
+                constraints['_enum_set'] = frozenset(allowed)
+            except TypeError:
+                # Unhashable allowed values keep the list scan
+                pass
+
+        for prop_spec in spec.get('properties', {}).values():
+            self._prepare_constraints(prop_spec)
+        self._prepare_constraints(spec.get('items'))
+
     def validate_field_attribute(
         self,
         attr_name: str,
@@ -218,9 +261,11 @@ class AttributeSchema:
 
         # Pattern matching for strings
         if isinstance(value, str) and 'pattern' in constraints:
-            import re
             pattern = constraints['pattern']
-            if not re.match(pattern, value):
+            compiled = self._patterns.get(pattern)
+            if compiled is None:
+                compiled = self._patterns[pattern] = re.compile(pattern)
+            if not compiled.match(value):
                 return ValidationResult(
                     valid=False,
                     error=f"Value '{value}' does not match pattern '{pattern}'"
@@ -228,7 +273,13 @@ class AttributeSchema:
 
         # Enum values
         if 'enum' in constraints:
-            if value not in constraints['enum']:
+            allowed = constraints['enum']
+            try:
+                found = value in constraints.get('_enum_set', allowed)
+            except TypeError:
+                # Unhashable value (e.g. a list, or a tuple holding one)
+                found = value in allowed
+            if not found:
                 return ValidationResult(
                     valid=False,
                     error=f"Value '{value}' not in allowed values: {constraints['enum']}"
@@ -325,10 +376,8 @@ class AttributeRegistry:
         Args:
             schema_path: Path to YAML schema file
         """
-        with open(schema_path, 'r') as f:
-            schema_dict = yaml.safe_load(f)
-
-        schema = AttributeSchema(schema_dict)
+        schema_path = Path(schema_path).resolve()
+        schema = _load_schema_file(schema_path, schema_path.stat().st_mtime_ns)
         self.schemas[schema.name] = schema
 
     def load_schema_from_dict(self, schema_dict: dict):
@@ -373,3 +422,25 @@ class AttributeRegistry:
             True if schema exists
         """
         return name in self.schemas
+
+
+@functools.lru_cache(maxsize=64)
+def _load_schema_file(schema_path: Path, mtime_ns: int) -> AttributeSchema:
+    """
+    Parse a YAML schema file, shared by every registry in the process.
+
+    Schemas are never modified after loading, so registries can share the
+    same AttributeSchema. The modification time is part of the cache key,
+    so an edited file is parsed again.
+
+    Args:
+        schema_path: Resolved path to YAML schema file
+        mtime_ns: Modification time of the file (cache key only)
+
+    Returns:
+        AttributeSchema
+    """
+    with open(schema_path, 'r') as f:
+        schema_dict = yaml.load(f, Loader=_YAML_LOADER)
+
+    return AttributeSchema(schema_dict)
@@ -4,7 +4,7 @@ Attribute validator for LumosInterface IDL.
 Validates attributes against registered schemas.
 """
 
-from typing import List
+from typing import Dict, FrozenSet, List, Tuple
 from ..ast.types import FieldInfo, TypeInfo, ValidationError
 from .registry import AttributeRegistry
 
@@ -30,6 +30,35 @@ class AttributeValidator:
         self.enabled_schemas = enabled_schemas
         self.warn_unknown = warn_unknown
 
+        # Attribute names known to any enabled schema, per attribute kind, so
+        # unknown attributes are found with one set difference per element.
+        # Maps section name -> (schemas the names came from, names)
+        self._known_names_cache: Dict[str, Tuple[tuple, FrozenSet[str]]] = {}
+
+    def _known_names(self, section: str) -> FrozenSet[str]:
+        """
+        Attribute names in one section of the enabled schemas.
+
+        Reads the registry on every call, so schemas loaded after this
+        validator was created are included; the union is only rebuilt when
+        the enabled schema objects differ from the last call.
+
+        Args:
+            section: 'field_attributes', 'struct_attributes' or 'enum_attributes'
+
+        Returns:
+            Frozenset of attribute names
+        """
+        schemas = tuple(
+            schema for schema in map(self.registry.get_schema, self.enabled_schemas)
+            if schema is not None
+        )
+        cached = self._known_names_cache.get(section)
+        if cached is None or cached[0] != schemas:
+            names = frozenset().union(*(getattr(schema, section) for schema in schemas))
+            cached = self._known_names_cache[section] = (schemas, names)
+        return cached[1]
+
     def validate_field_attributes(
         self,
         field_info: FieldInfo
@@ -51,9 +80,23 @@ class AttributeValidator:
             **field_info.indented_attributes
         }
 
+        unknown = all_attrs.keys() - self._known_names('field_attributes')
+
         for attr_name, attr_value in all_attrs.items():
+            # Warn about unknown attributes (not in any enabled schema)
+            if attr_name in unknown:
+                if self.warn_unknown:
+                    errors.append(ValidationError(
+                        file_path=field_info.file_path,
+                        line=field_info.line_number,
+                        column=0,
+                        message=f"Unknown attribute '{attr_name}' (not in enabled schemas: {', '.join(self.enabled_schemas)})",
+                        error_type="unknown_attribute",
+                        severity="warning"
+                    ))
+                continue
+
             # Try to validate against each enabled schema
-            validated = False
             validation_errors = []
 
             for schema_name in self.enabled_schemas:
@@ -70,7 +113,6 @@ class AttributeValidator:
                         validation_errors.append((schema_name, result.error))
                     else:
                         # Valid in this schema
-                        validated = True
                         validation_errors.clear()
                         break
 
@@ -86,17 +128,6 @@ class AttributeValidator:
                         severity="error"
                     ))
 
-            # Warn about unknown attributes (not in any enabled schema)
-            if not validated and self.warn_unknown and not validation_errors:
-                errors.append(ValidationError(
-                    file_path=field_info.file_path,
-                    line=field_info.line_number,
-                    column=0,
-                    message=f"Unknown attribute '{attr_name}' (not in enabled schemas: {', '.join(self.enabled_schemas)})",
-                    error_type="unknown_attribute",
-                    severity="warning"
-                ))
-
         return errors
 
     def validate_struct_attributes(
@@ -114,8 +145,21 @@ class AttributeValidator:
         """
         errors = []
 
+        unknown = type_info.struct_attributes.keys() - self._known_names('struct_attributes')
+
         for attr_name, attr_value in type_info.struct_attributes.items():
-            validated = False
+            if attr_name in unknown:
+                if self.warn_unknown:
+                    errors.append(ValidationError(
+                        file_path=type_info.file_path,
+                        line=0,
+                        column=0,
+                        message=f"Unknown struct attribute '{attr_name}' (not in enabled schemas: {', '.join(self.enabled_schemas)})",
+                        error_type="unknown_attribute",
+                        severity="warning"
+                    ))
+                continue
+
             validation_errors = []
 
             for schema_name in self.enabled_schemas:
@@ -129,7 +173,6 @@ class AttributeValidator:
                     if not result.valid:
                         validation_errors.append((schema_name, result.error))
                     else:
-                        validated = True
                         validation_errors.clear()
                         break
 
@@ -145,16 +188,6 @@ class AttributeValidator:
                         severity="error"
                     ))
 
-            if not validated and self.warn_unknown and not validation_errors:
-                errors.append(ValidationError(
-                    file_path=type_info.file_path,
-                    line=0,
-                    column=0,
-                    message=f"Unknown struct attribute '{attr_name}' (not in enabled schemas: {', '.join(self.enabled_schemas)})",
-                    error_type="unknown_attribute",
-                    severity="warning"
-                ))
-
         return errors
 
     def validate_enum_attributes(
@@ -172,8 +205,21 @@ class AttributeValidator:
         """
         errors = []
 
+        unknown = type_info.struct_attributes.keys() - self._known_names('enum_attributes')
+
         for attr_name, attr_value in type_info.struct_attributes.items():
-            validated = False
+            if attr_name in unknown:
+                if self.warn_unknown:
+                    errors.append(ValidationError(
+                        file_path=type_info.file_path,
+                        line=0,
+                        column=0,
+                        message=f"Unknown enum attribute '{attr_name}' (not in enabled schemas: {', '.join(self.enabled_schemas)})",
+                        error_type="unknown_attribute",
+                        severity="warning"
+                    ))
+                continue
+
             validation_errors = []
 
             for schema_name in self.enabled_schemas:
@@ -187,7 +233,6 @@ class AttributeValidator:
                     if not result.valid:
                         validation_errors.append((schema_name, result.error))
                     else:
-                        validated = True
                         validation_errors.clear()
                         break
 
@@ -203,14 +248,4 @@ class AttributeValidator:
                         severity="error"
                     ))
 
-            if not validated and self.warn_unknown and not validation_errors:
-                errors.append(ValidationError(
-                    file_path=type_info.file_path,
-                    line=0,
-                    column=0,
-                    message=f"Unknown enum attribute '{attr_name}' (not in enabled schemas: {', '.join(self.enabled_schemas)})",
-                    error_type="unknown_attribute",
-                    severity="warning"
-                ))
-
         return errors
@@ -29,6 +29,23 @@ class ValidationConfig:
     enforce_naming_conventions: bool = False
 
 
+# Lark parsing algorithms the grammar can be built with
+PARSER_ALGORITHMS = ("lalr", "earley")
+
+
+@dataclass
+class ParserConfig:
+    """Parser configuration."""
+    algorithm: str = "lalr"  # Lark parsing algorithm: "lalr" (fast) or "earley"
+
+    def __post_init__(self):
+        if self.algorithm not in PARSER_ALGORITHMS:
+            raise ValueError(
+                f"Invalid parser algorithm '{self.algorithm}'. "
+                f"Expected one of: {', '.join(PARSER_ALGORITHMS)}"
+            )
+
+
 @dataclass
 class NamingConfig:
     """Naming convention patterns."""
@@ -79,6 +96,7 @@ class Config:
 
     def __init__(self):
         self.search_paths: List[Path] = [Path(".")]
+        self.parser: ParserConfig = ParserConfig()
         self.validation: ValidationConfig = ValidationConfig()
         self.naming: NamingConfig = NamingConfig()
         self.codegen: CodegenConfig = CodegenConfig()
@@ -106,6 +124,13 @@ class Config:
         if "search_paths" in data and "paths" in data["search_paths"]:
             config.search_paths = [Path(p) for p in data["search_paths"]["paths"]]
 
+        # Parse parser config
+        if "parser" in data:
+            par_data = data["parser"]
+            config.parser = ParserConfig(
+                algorithm=par_data.get("algorithm", "lalr"),
+            )
+
         # Parse validation config
         if "validation" in data:
             val_data = data["validation"]
@@ -181,6 +206,9 @@ class Config:
             "search_paths": {
                 "paths": [str(p) for p in self.search_paths]
             },
+            "parser": {
+                "algorithm": self.parser.algorithm,
+            },
             "validation": {
                 "enforce_field_numbering": self.validation.enforce_field_numbering,
                 "allow_negative_field_numbers": self.validation.allow_negative_field_numbers,
@@ -6,7 +6,7 @@ Handles parsing of IDL files using Lark grammar and indentation preprocessing.
 
 from pathlib import Path
 from typing import Optional
-from lark import Lark, Tree
+from lark import Lark, Token, Tree
 from lark.exceptions import LarkError
 
 from .grammar_loader import load_grammar
@@ -26,9 +26,20 @@ class ASTParser:
             config: Configuration object (optional)
         """
         self.config = config or Config.default()
-        self.parser = load_grammar()
         self.preprocessor = IndentationPreprocessor()
 
+    def _parse(self, preprocessed: str) -> Tree:
+        """
+        Parse preprocessed source with the configured grammar.
+
+        Args:
+            preprocessed: Source with INDENT/DEDENT markers
+
+        Returns:
+            Lark parse tree
+        """
+        return load_grammar(self.config.parser.algorithm).parse(preprocessed)
+
     def parse_file(self, file_path: str) -> ParseResult:
         """
         Parse a single IDL file.
@@ -61,7 +72,7 @@ class ASTParser:
             preprocessed = self.preprocessor.process(content)
 
             # Parse with Lark
-            ast = self.parser.parse(preprocessed)
+            ast = self._parse(preprocessed)
 
             # Create FileInfo
             file_info = FileInfo(
@@ -108,13 +119,16 @@ class ASTParser:
 
         return result
 
-    def parse_string(self, content: str, file_path: str = "<string>") -> ParseResult:
+    def parse_string(self, content: str, file_path: str = "<string>",
+                     skip_preprocessing: bool = False) -> ParseResult:
         """
         Parse IDL content from a string.
 
         Args:
             content: IDL source code
             file_path: Virtual file path for error reporting
+            skip_preprocessing: Content already has INDENT/DEDENT markers
+                (e.g. from IndentationPreprocessor.process), so parse it as-is
 
         Returns:
             ParseResult with parsed AST and any errors
@@ -124,10 +138,13 @@ class ASTParser:
 
         try:
             # Preprocess indentation
-            preprocessed = self.preprocessor.process(content)
+            if skip_preprocessing:
+                preprocessed = content
+            else:
+                preprocessed = self.preprocessor.process(content)
 
             # Parse with Lark
-            ast = self.parser.parse(preprocessed)
+            ast = self._parse(preprocessed)
 
             # Create FileInfo
             file_info = FileInfo(
@@ -215,21 +232,8 @@ class ASTParser:
         """
         # Extract imports
         for import_node in ast.find_data("import_stmt"):
-            # import_node.children[0] is the import_path
-            import_path_node = import_node.children[0]
-            # import_path is a tree with path_segment children
-            path_segments = []
-            for segment in import_path_node.children:
-                if hasattr(segment, 'value'):
-                    path_segments.append(segment.value)
-                elif hasattr(segment, 'children'):
-                    # Handle dotted segments like geo.types
-                    for part in segment.children:
-                        if hasattr(part, 'value'):
-                            path_segments.append(part.value)
-
-            import_path = "/".join(path_segments)
-            file_info.imports.append(import_path)
+            # import_node.children[0] is the IMPORT_PATH token (e.g. "common/geometry")
+            file_info.imports.append(import_node.children[0].value)
 
         # Extract using namespace statements
         for using_ns_node in ast.find_data("using_namespace_stmt"):
@@ -257,8 +261,4 @@ class ASTParser:
         Returns:
             Namespace string like "common::geometry"
         """
-        parts = []
-        for child in node.children:
-            if hasattr(child, 'value'):
-                parts.append(child.value)
-        return "::".join(parts)
+        return "::".join(child.value for child in node.children if isinstance(child, Token))
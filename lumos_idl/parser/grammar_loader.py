@@ -6,26 +6,28 @@ Loads and caches the Lark grammar file.
 
 from pathlib import Path
 from lark import Lark
-from typing import Optional
+from typing import Dict
 
 
-# Global grammar cache
-_grammar_cache: Optional[Lark] = None
+# Global grammar cache, keyed by parsing algorithm
+_grammar_cache: Dict[str, Lark] = {}
 
 
-def load_grammar() -> Lark:
+def load_grammar(algorithm: str = 'lalr') -> Lark:
     """
     Load the Lark grammar file.
 
     Uses a global cache to avoid reloading the grammar multiple times.
 
+    Args:
+        algorithm: Lark parsing algorithm ("lalr" or "earley"). The grammar
+            is LALR(1), so "lalr" is the default and by far the faster choice.
+
     Returns:
         Lark parser instance
     """
-    global _grammar_cache
-
-    if _grammar_cache is not None:
-        return _grammar_cache
+    if algorithm in _grammar_cache:
+        return _grammar_cache[algorithm]
 
     # Find grammar file relative to this module
     grammar_file = Path(__file__).parent.parent.parent / "grammar" / "message.lark"
@@ -36,19 +38,18 @@ def load_grammar() -> Lark:
     with open(grammar_file, 'r') as f:
         grammar_text = f.read()
 
-    # Create Lark parser with LALR algorithm
+    # Create Lark parser with the requested algorithm
     parser = Lark(
         grammar_text,
-        parser='lalr',
+        parser=algorithm,
         start='start',
         propagate_positions=True,  # Include line/column info in AST
     )
 
-    _grammar_cache = parser
+    _grammar_cache[algorithm] = parser
     return parser
 
 
 def clear_grammar_cache():
     """Clear the grammar cache. Useful for testing."""
-    global _grammar_cache
-    _grammar_cache = None
+    _grammar_cache.clear()
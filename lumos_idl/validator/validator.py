@@ -6,7 +6,7 @@ Coordinates all validation phases.
 
 from pathlib import Path
 from typing import List, Set, Optional, Any, Dict, Tuple
-from lark import Tree
+from lark import Token, Tree
 
 from .symbol_table import SymbolTable
 from .error_reporter import ErrorReporter
@@ -27,6 +27,20 @@ from ..ast.types import (
 from ..config import Config
 
 
+# Built-in type names from the grammar, shared by every validator instance
+PRIMITIVE_TYPES = frozenset({
+    "bool",
+    "int8", "int16", "int32", "int64",
+    "uint8", "uint16", "uint32", "uint64",
+    "float32", "float64",
+    "string", "bytes",
+})
+COLLECTION_TYPES = frozenset({"array", "matrix", "tensor"})
+
+# Names a field type check can accept with a single lookup
+BUILTIN_TYPES = PRIMITIVE_TYPES | COLLECTION_TYPES
+
+
 class IDLValidator:
     """Main validator orchestrator."""
 
@@ -57,7 +71,8 @@ class IDLValidator:
                 # Log error but don't fail initialization
                 pass
 
-        # Create attribute validator if schemas are enabled
+        # Create attribute validator if schemas are enabled; without one the
+        # attribute phase of validate() is skipped entirely
         self.attribute_validator = None
         if self.config.attributes.enabled_schemas:
             self.attribute_validator = AttributeValidator(
@@ -67,13 +82,7 @@ class IDLValidator:
             )
 
         # Primitive types
-        self.primitive_types = {
-            "bool",
-            "int8", "int16", "int32", "int64",
-            "uint8", "uint16", "uint32", "uint64",
-            "float32", "float64",
-            "string", "bytes",
-        }
+        self.primitive_types = PRIMITIVE_TYPES
 
     def validate(self, parse_result: ValidationResult) -> ValidationResult:
         """
@@ -177,6 +186,11 @@ class IDLValidator:
         if file_info.ast is None:
             return
 
+        # Start from empty lists so validating the same files again does
+        # not append every type and alias a second time
+        file_info.defined_types.clear()
+        file_info.defined_aliases.clear()
+
         # Extract struct definitions
         for struct_node in file_info.ast.find_data("struct_def"):
             self._extract_struct(struct_node, file_info)
@@ -486,11 +500,9 @@ class IDLValidator:
                         type_name = type_node.children[0].value
                 elif type_node.data == 'qualified_type':
                     # Qualified type like common::geometry::Vector3
-                    parts = []
-                    for child in type_node.children:
-                        if hasattr(child, 'value'):
-                            parts.append(child.value)
-                    type_name = "::".join(parts)
+                    type_name = "::".join(
+                        child.value for child in type_node.children if isinstance(child, Token)
+                    )
                 elif type_node.data == 'collection_type':
                     # Collection type - simplified
                     type_name = "array"
@@ -572,11 +584,9 @@ class IDLValidator:
                 # qualified_type_field: qualified_type CNAME ...
                 if len(field_node.children) >= 2:
                     qualified_type = field_node.children[0]
-                    parts = []
-                    for child in qualified_type.children:
-                        if hasattr(child, 'value'):
-                            parts.append(child.value)
-                    type_name = "::".join(parts)
+                    type_name = "::".join(
+                        child.value for child in qualified_type.children if isinstance(child, Token)
+                    )
                     field_name = field_node.children[1].value
 
             elif field_node.data == 'collection_type_field':
@@ -677,14 +687,11 @@ class IDLValidator:
         """
         type_name = field.type_name
 
-        # Check if primitive type
-        if type_name in self.primitive_types:
+        # Primitive and collection types are always valid (full collection
+        # validation happens in a later phase)
+        if type_name in BUILTIN_TYPES:
             return  # Valid
 
-        # Check if it's a collection type (basic check)
-        if type_name in ('array', 'matrix', 'tensor'):
-            return  # Valid (full collection validation in later phase)
-
         # Try to resolve as a type alias first
         resolved_alias = self.symbol_table.lookup_alias(type_name, file_info)
         if resolved_alias is not None:
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3.9
+"""
+Run the struct, using, type alias and validation test scripts in one process.
+
+Running them together pays interpreter startup and the Lark import once
+instead of once per script.
+"""
+
+import sys
+
+import test_struct_standalone
+import test_using_standalone
+import test_type_aliases
+import test_validation
+
+
+SUITES = [
+    test_struct_standalone.main,
+    test_using_standalone.main,
+    test_type_aliases.main,
+    test_validation.main,
+]
+
+
+def main():
+    """Run every suite (even after a failure) and return 1 if any failed."""
+    # Build the shared parser up front so grammar errors surface before any output
+    test_struct_standalone.load_parser()
+
+    status = 0
+    for suite in SUITES:
+        status |= suite()
+        print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
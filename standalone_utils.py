@@ -0,0 +1,158 @@
+#!/usr/bin/env python3.9
+"""
+Helpers shared by the standalone test scripts - no pytest required.
+
+Parsers come from tests/parser_factory.py, so LUMOS_USE_CYTHON=1 and
+LUMOS_LARK_CACHE_DIR apply here as they do to the pytest suite.
+"""
+
+import contextlib
+import functools
+import io
+import sys
+from collections import Counter
+from lark import Transformer, Tree
+from lark.exceptions import LarkError, UnexpectedInput
+
+from indentation_preprocessor import IndentationPreprocessor
+from tests.parser_factory import PARSER_CACHE_DIR, build_lalr_parser
+from tests.tree_utils import count_data
+
+
+@functools.lru_cache(maxsize=1)
+def load_parser():
+    """Create the parser from the grammar text (built once, then shared)."""
+    # No standalone test reads line/column info, so skip position propagation
+    return build_lalr_parser(PARSER_CACHE_DIR / "message.lark.cache", propagate_positions=False)
+
+
+class _DiscardTree(Transformer):
+    """Inline transformer that drops every node, so no parse tree is built."""
+
+    # Lark splices the children of inlined (_rule) nodes into their parent,
+    # so every rule reduces to this one shared, childless tree
+    _EMPTY = Tree("_", [])
+
+    def __default__(self, data, children, meta):
+        return self._EMPTY
+
+
+@functools.lru_cache(maxsize=1)
+def load_recognizer():
+    """Create a parser for accept/reject checks only; it builds no parse tree."""
+    return build_lalr_parser(PARSER_CACHE_DIR / "message.lark.recognizer.cache",
+                             transformer=_DiscardTree())
+
+
+# The preprocessor keeps no state between process() calls, so one instance is shared
+_PREPROCESSOR = IndentationPreprocessor()
+
+
+def preprocess(code):
+    """Preprocess indentation."""
+    return _PREPROCESSOR.process(code)
+
+
+def parse_snippet(code):
+    """Preprocess and parse one IDL snippet."""
+    return load_parser().parse(preprocess(code))
+
+
+def subtrees_named(tree, name):
+    """Return subtrees for one rule, filtering iter_subtrees() directly."""
+    return [subtree for subtree in tree.iter_subtrees() if subtree.data == name]
+
+
+def collect(tree, names):
+    """Group subtrees whose rule is in names, in one top-down tree walk."""
+    found = {name: [] for name in names}
+    for subtree in tree.iter_subtrees_topdown():
+        if subtree.data in found:
+            found[subtree.data].append(subtree)
+    return found
+
+
+def rule_counts(tree):
+    """Count subtrees per rule name in one top-down walk."""
+    counts = Counter()
+    for subtree in tree.iter_subtrees_topdown():
+        counts[subtree.data] += 1
+    return counts
+
+
+def child_trees(node, rule):
+    """Yield the direct child subtrees of node for a rule (no tree walk)."""
+    return (child for child in node.children if isinstance(child, Tree) and child.data == rule)
+
+
+def parse_all(cases, rule, prepare=None):
+    """Check that every (code, description) case is accepted.
+
+    All snippets are parsed together as one source. Cases are only parsed
+    one by one when that combined parse fails, to pinpoint the rejected one.
+    prepare, if given, is applied to each source before parsing (e.g.
+    preprocess). Returns (description, error) pairs, with error None for
+    accepted cases.
+    """
+    if prepare is None:
+        prepare = str
+
+    try:
+        tree = load_parser().parse(prepare("".join(code for code, _ in cases)))
+        if count_data(tree, rule) == len(cases):
+            return [(description, None) for _, description in cases]
+    except LarkError:
+        pass
+
+    parser = load_recognizer()
+    results = []
+    for code, description in cases:
+        try:
+            parser.parse(prepare(code))
+            results.append((description, None))
+        except LarkError as e:
+            results.append((description, e))
+    return results
+
+
+def check_rejected(parser, cases, prepare=None):
+    """Check that every (code, description, error_type, (line, column)) case is rejected.
+
+    A case passes only when parsing raises exactly error_type at that
+    position. Errors that are not UnexpectedInput (e.g. from preprocessing)
+    propagate instead of counting as a rejection. prepare works as in
+    parse_all. Returns (passed, failed).
+    """
+    if prepare is None:
+        prepare = str
+
+    passed = 0
+    failed = 0
+
+    for code, description, error_type, position in cases:
+        source = prepare(code)
+        try:
+            parser.parse(source)
+            print(f"✗ {description} - should have been rejected!")
+            failed += 1
+        except UnexpectedInput as e:
+            found = (type(e), (e.line, e.column))
+            if found == (error_type, position):
+                print(f"✓ {description} - correctly rejected at line {e.line}, column {e.column}")
+                passed += 1
+            else:
+                print(f"✗ {description} - expected {error_type.__name__} at {position}, "
+                      f"got {type(e).__name__} at {(e.line, e.column)}")
+                failed += 1
+
+    return passed, failed
+
+
+def run_buffered(func):
+    """Run func with its output collected in memory and written out in one go."""
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return func()
+    finally:
+        sys.stdout.write(buffer.getvalue())
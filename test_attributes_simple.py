@@ -9,6 +9,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from lumos_idl import IDLProcessor, Config
+from lumos_idl.ast.types import FieldInfo
+from lumos_idl.attributes.registry import AttributeRegistry
+from lumos_idl.attributes.validator import AttributeValidator
 
 def test_can_bus_attributes():
     """Test CAN bus attribute validation."""
@@ -106,7 +109,7 @@ struct Data
 
         if not result.success:
             # Should fail - ID is too large
-            has_range_error = any("greater than maximum" in e.message for e in result.errors)
+            has_range_error = result.has_error("greater than maximum")
             if has_range_error:
                 print("✓ Invalid attribute detection test PASSED")
                 return True
@@ -151,6 +154,30 @@ struct Data
             return False
 
 
+def test_schema_loaded_after_validator():
+    """Test that a schema loaded after the validator was created is used."""
+    print("\nTesting a schema loaded after the validator...")
+
+    registry = AttributeRegistry()
+    validator = AttributeValidator(registry, ["units"])
+    registry.load_schema_from_dict({
+        'schema_name': 'units',
+        'field_attributes': {'unit': {'type': 'string'}},
+    })
+
+    field = FieldInfo(name="speed", type_name="float32", inline_attributes={'unit': "m/s"})
+    errors = validator.validate_field_attributes(field)
+
+    if not errors:
+        print("✓ Late schema test PASSED")
+        return True
+    else:
+        print("✗ Late schema test FAILED")
+        for error in errors:
+            print(f"  {error.message}")
+        return False
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Attribute Validation Tests")
@@ -161,6 +188,7 @@ if __name__ == "__main__":
     results.append(test_validation_attributes())
     results.append(test_invalid_attribute())
     results.append(test_no_schemas())
+    results.append(test_schema_loaded_after_validator())
 
     print("\n" + "=" * 60)
     passed = sum(results)
@@ -6,9 +6,30 @@ Tests the complete flow from parsing to potential validation.
 """
 
 from lumos_idl import IDLProcessor, Config
+from lumos_idl.parser.preprocessor import IndentationPreprocessor
 from pathlib import Path
 
 
+# Snippets for the individual feature tests (test 6)
+_RAW_FEATURES = [
+    ("Imports", "import common/geometry\n"),
+    ("Type Aliases", "using Timestamp = uint64\n"),
+    ("Constants", "const uint8 MAX = 10\n"),
+    ("Using Namespace", "using namespace common::geometry\n"),
+    ("Namespace Alias", "namespace geo = common::geometry\n"),
+    ("Simple Struct", "struct Point\n    float32 x\n    float32 y\n"),
+    ("Struct with Numbers", "struct Data\n    uint32 id : 0\n    string name : 1\n"),
+    ("Optional Field", "struct Config\n    optional string name\n"),
+    ("Inline Attributes", "struct User\n    uint32 id @primary(true)\n"),
+    ("Array Type", "struct Buffer\n    array<uint8, 100> data\n"),
+    ("Interface", "interface Protocol\n    uint32 id\n    string payload\n"),
+]
+
+# The snippets are constants, so indentation preprocessing is done once at import
+_PREPROCESSOR = IndentationPreprocessor()
+FEATURES = [(name, _PREPROCESSOR.process(code)) for name, code in _RAW_FEATURES]
+
+
 def test_complete_workflow():
     """Test complete workflow with multiple features."""
 
@@ -73,11 +94,11 @@ struct DataLogger
 """
 
     processor = IDLProcessor(config)
-    result = processor.parse_string(complex_idl, "test_complex.msg")
+    complex_result = processor.parse_string(complex_idl, "test_complex.msg")
 
-    if result.success:
+    if complex_result.success:
         print("✓ Parsing succeeded")
-        for file_path, file_info in result.files.items():
+        for file_path, file_info in complex_result.files.items():
             print(f"  File: {file_path}")
             print(f"  Namespace: {file_info.namespace}")
             print(f"  Imports: {file_info.imports}")
@@ -85,7 +106,7 @@ struct DataLogger
             print(f"  Namespace aliases: {file_info.namespace_aliases}")
     else:
         print("✗ Parsing failed")
-        for error in result.errors:
+        for error in complex_result.errors:
             print(f"  {error}")
         return False
     print()
@@ -112,11 +133,11 @@ struct DataLogger
             print(f"⊘ {test_file} not found")
     print()
 
-    # Test 4: Process with validation (currently just parsing)
+    # Test 4: Validate the result parsed in test 2 (no second parse)
     print("4. Process Files (Parse + Validate)")
     print("-" * 70)
 
-    result = processor.process_string(complex_idl, "test_validation.msg")
+    result = processor.validate(complex_result)
 
     if result.success:
         print("✓ Processing succeeded")
@@ -151,23 +172,9 @@ struct DataLogger
     print("6. Individual Feature Tests")
     print("-" * 70)
 
-    features = [
-        ("Imports", "import common/geometry\n"),
-        ("Type Aliases", "using Timestamp = uint64\n"),
-        ("Constants", "const uint8 MAX = 10\n"),
-        ("Using Namespace", "using namespace common::geometry\n"),
-        ("Namespace Alias", "namespace geo = common::geometry\n"),
-        ("Simple Struct", "struct Point\n    float32 x\n    float32 y\n"),
-        ("Struct with Numbers", "struct Data\n    uint32 id : 0\n    string name : 1\n"),
-        ("Optional Field", "struct Config\n    optional string name\n"),
-        ("Inline Attributes", "struct User\n    uint32 id @primary(true)\n"),
-        ("Array Type", "struct Buffer\n    array<uint8, 100> data\n"),
-        ("Interface", "interface Protocol\n    uint32 id\n    string payload\n"),
-    ]
-
     feature_results = []
-    for name, code in features:
-        result = processor.parse_string(code, f"test_{name}.msg")
+    for name, code in FEATURES:
+        result = processor.parse_string(code, f"test_{name}.msg", skip_preprocessing=True)
         if result.success:
             print(f"✓ {name}")
             feature_results.append(True)
@@ -3,48 +3,103 @@
 Standalone test for namespace features - no pytest required.
 """
 
-from lark import Lark
-from lark.exceptions import LarkError
-from pathlib import Path
-from indentation_preprocessor import IndentationPreprocessor
+from lark import Token, Transformer
+from lark.exceptions import LarkError, UnexpectedToken
 
+from standalone_utils import (
+    check_rejected, collect, load_parser, parse_snippet, preprocess, subtrees_named,
+)
 
-def load_parser():
-    """Load the grammar file and create parser."""
-    grammar_file = Path("grammar/message.lark")
 
-    with open(grammar_file) as f:
-        grammar = f.read()
+class NamespaceExtractor(Transformer):
+    """Reduce namespace aliases and qualified-type fields to plain values in one pass."""
 
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
+    def __init__(self):
+        super().__init__()
+        self.aliases = []           # (alias_name, [namespace segments])
+        self.qualified_fields = []  # ([type segments], field_name)
 
+    def qualified_namespace(self, children):
+        return [c.value for c in children if c.type != 'NAMESPACE_SEP']
 
-def preprocess(code):
-    """Preprocess indentation."""
-    preprocessor = IndentationPreprocessor()
-    return preprocessor.process(code)
+    qualified_type = qualified_namespace
 
+    def namespace_alias_stmt(self, children):
+        self.aliases.append((children[0].value, children[1]))
+        return children
 
-def test_using_namespace():
-    """Test using namespace statement."""
-    parser = load_parser()
+    def qualified_type_field(self, children):
+        self.qualified_fields.append((children[0], children[1].value))
+        return children
+
+
+# IDL snippets used by the tests below, keyed by test name
+_SNIPPETS = {
+    "qualified_namespace": """using namespace common::geometry
+namespace cg = common::geometry::types
+""",
+    "qualified_type_in_field": """struct Transform
+    common::geometry::Vector3 position
+    common::geometry::Vector3 rotation
+    common::geometry::Quaternion orientation
+""",
+    "mixed_qualified_and_simple_types": """struct Data
+    uint32 id
+    Vector3 localPos
+    common::geometry::Vector3 worldPos
+    float64 timestamp
+""",
+    "full_namespace_example": """import common/geometry
+
+using namespace common::geometry
+
+namespace cg = common::geometry
+
+struct Transform
+    Vector3 position
+    cg::Vector3 rotation
+    common::geometry::Quaternion orientation
+""",
+    "namespace_extraction": """namespace geo = common::geometry::types
+""",
+    "qualified_type_extraction": """struct Test
+    common::geometry::Vector3 pos
+""",
+}
+
+# Single-line statement cases, newline-terminated up front
+_USING_NS_CASES = [(code_line + "\n", description) for code_line, description in [
+    ('using namespace common::geometry', 'simple namespace'),
+    ('using namespace std', 'single segment namespace'),
+    ('using namespace common::geometry::types', 'multi-level namespace'),
+    ('using namespace a::b::c::d::e', 'deeply nested namespace'),
+]]
+
+_NS_ALIAS_CASES = [(code_line + "\n", description) for code_line, description in [
+    ('namespace cg = common::geometry', 'simple alias'),
+    ('namespace geo = geometry', 'alias for single segment'),
+    ('namespace types = common::geometry::types', 'multi-level alias'),
+    ('namespace xyz = a::b::c', 'multi-segment alias'),
+]]
+
+# (code, description, expected error, (line, column) it is reported at)
+_INVALID_NS_CASES = [(code_line + "\n", description, error, position)
+                     for code_line, description, error, position in [
+    ('using namespace', 'missing namespace name', UnexpectedToken, (1, 7)),
+    ('namespace = common::geometry', 'missing alias name', UnexpectedToken, (1, 11)),
+    ('namespace cg = ', 'missing target namespace', UnexpectedToken, (1, 14)),
+]]
 
-    tests = [
-        ('using namespace common::geometry', 'simple namespace'),
-        ('using namespace std', 'single segment namespace'),
-        ('using namespace common::geometry::types', 'multi-level namespace'),
-        ('using namespace a::b::c::d::e', 'deeply nested namespace'),
-    ]
 
+def test_using_namespace():
+    """Test using namespace statement."""
     passed = 0
     failed = 0
 
-    for code_line, description in tests:
-        code = f"{code_line}\n"
+    for code, description in _USING_NS_CASES:
         try:
-            processed = preprocess(code)
-            tree = parser.parse(processed)
-            stmts = list(tree.find_data("using_namespace_stmt"))
+            tree = parse_snippet(code)
+            stmts = subtrees_named(tree, "using_namespace_stmt")
             if len(stmts) == 1:
                 print(f"✓ using namespace: {description}")
                 passed += 1
@@ -60,24 +115,13 @@ def test_using_namespace():
 
 def test_namespace_alias():
     """Test namespace alias statement."""
-    parser = load_parser()
-
-    tests = [
-        ('namespace cg = common::geometry', 'simple alias'),
-        ('namespace geo = geometry', 'alias for single segment'),
-        ('namespace types = common::geometry::types', 'multi-level alias'),
-        ('namespace xyz = a::b::c', 'multi-segment alias'),
-    ]
-
     passed = 0
     failed = 0
 
-    for code_line, description in tests:
-        code = f"{code_line}\n"
+    for code, description in _NS_ALIAS_CASES:
         try:
-            processed = preprocess(code)
-            tree = parser.parse(processed)
-            stmts = list(tree.find_data("namespace_alias_stmt"))
+            tree = parse_snippet(code)
+            stmts = subtrees_named(tree, "namespace_alias_stmt")
             if len(stmts) == 1:
                 # Extract alias name and target namespace
                 alias_name = stmts[0].children[0].value
@@ -95,28 +139,21 @@ def test_namespace_alias():
 
 def test_qualified_namespace():
     """Test qualified namespace parsing."""
-    parser = load_parser()
-
-    code = """using namespace common::geometry
-namespace cg = common::geometry::types
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["qualified_namespace"])
 
         # Find all qualified namespaces
-        namespaces = list(tree.find_data("qualified_namespace"))
+        namespaces = subtrees_named(tree, "qualified_namespace")
 
         if len(namespaces) == 2:
             # Extract namespace segments (filter out :: separators)
             ns1_parts = [child.value for child in namespaces[0].children
-                        if hasattr(child, 'value') and child.value != '::']
+                        if isinstance(child, Token) and child.type != 'NAMESPACE_SEP']
             ns2_parts = [child.value for child in namespaces[1].children
-                        if hasattr(child, 'value') and child.value != '::']
+                        if isinstance(child, Token) and child.type != 'NAMESPACE_SEP']
 
             if ns1_parts == ['common', 'geometry'] and ns2_parts == ['common', 'geometry', 'types']:
                 print(f"✓ qualified namespace extraction: {ns1_parts}, {ns2_parts}")
@@ -137,23 +174,14 @@ namespace cg = common::geometry::types
 
 def test_qualified_type_in_field():
     """Test qualified type names in struct fields."""
-    parser = load_parser()
-
-    code = """struct Transform
-    common::geometry::Vector3 position
-    common::geometry::Vector3 rotation
-    common::geometry::Quaternion orientation
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["qualified_type_in_field"])
 
         # Find qualified type fields
-        qualified_fields = list(tree.find_data("qualified_type_field"))
+        qualified_fields = subtrees_named(tree, "qualified_type_field")
 
         if len(qualified_fields) == 3:
             print(f"✓ qualified type fields: {len(qualified_fields)} fields")
@@ -171,27 +199,18 @@ def test_qualified_type_in_field():
 
 def test_mixed_qualified_and_simple_types():
     """Test mixing qualified and simple type names."""
-    parser = load_parser()
-
-    code = """struct Data
-    uint32 id
-    Vector3 localPos
-    common::geometry::Vector3 worldPos
-    float64 timestamp
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["mixed_qualified_and_simple_types"])
 
         # Count different field types
-        primitive_fields = len([f for f in tree.find_data("struct_field")
+        found = collect(tree, ("struct_field", "user_type_field", "qualified_type_field"))
+        primitive_fields = len([f for f in found["struct_field"]
                                if f.children[0].data == "primitive_type"])
-        user_fields = len(list(tree.find_data("user_type_field")))
-        qualified_fields = len(list(tree.find_data("qualified_type_field")))
+        user_fields = len(found["user_type_field"])
+        qualified_fields = len(found["qualified_type_field"])
 
         if primitive_fields == 2 and user_fields == 1 and qualified_fields == 1:
             print(f"✓ mixed types: {primitive_fields} primitive, {user_fields} user, {qualified_fields} qualified")
@@ -209,31 +228,18 @@ def test_mixed_qualified_and_simple_types():
 
 def test_full_namespace_example():
     """Test complete example with imports and namespace usage."""
-    parser = load_parser()
-
-    code = """import common/geometry
-
-using namespace common::geometry
-
-namespace cg = common::geometry
-
-struct Transform
-    Vector3 position
-    cg::Vector3 rotation
-    common::geometry::Quaternion orientation
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["full_namespace_example"])
 
-        imports = list(tree.find_data("import_stmt"))
-        using_ns = list(tree.find_data("using_namespace_stmt"))
-        ns_alias = list(tree.find_data("namespace_alias_stmt"))
-        structs = list(tree.find_data("struct_def"))
+        found = collect(tree, ("import_stmt", "using_namespace_stmt",
+                               "namespace_alias_stmt", "struct_def"))
+        imports = found["import_stmt"]
+        using_ns = found["using_namespace_stmt"]
+        ns_alias = found["namespace_alias_stmt"]
+        structs = found["struct_def"]
 
         if len(imports) == 1 and len(using_ns) == 1 and len(ns_alias) == 1 and len(structs) == 1:
             print(f"✓ full namespace example: all statements parsed")
@@ -251,27 +257,16 @@ struct Transform
 
 def test_namespace_extraction():
     """Test extracting namespace components."""
-    parser = load_parser()
-
-    code = """namespace geo = common::geometry::types
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
-
-        alias_stmt = list(tree.find_data("namespace_alias_stmt"))[0]
-
-        # Extract alias name
-        alias_name = alias_stmt.children[0].value
+        tree = parse_snippet(_SNIPPETS["namespace_extraction"])
 
-        # Extract qualified namespace (filter out :: separators)
-        qualified_ns = alias_stmt.children[1]
-        ns_parts = [child.value for child in qualified_ns.children
-                   if hasattr(child, 'value') and child.value != '::']
+        # Extract alias name and namespace segments (:: separators dropped)
+        extractor = NamespaceExtractor()
+        extractor.transform(tree)
+        alias_name, ns_parts = extractor.aliases[0]
 
         if alias_name == "geo" and ns_parts == ['common', 'geometry', 'types']:
             print(f"✓ namespace extraction: alias={alias_name}, namespace={ns_parts}")
@@ -289,28 +284,16 @@ def test_namespace_extraction():
 
 def test_qualified_type_extraction():
     """Test extracting qualified type components."""
-    parser = load_parser()
-
-    code = """struct Test
-    common::geometry::Vector3 pos
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
-
-        field = list(tree.find_data("qualified_type_field"))[0]
+        tree = parse_snippet(_SNIPPETS["qualified_type_extraction"])
 
-        # Extract qualified type (filter out :: separators)
-        qualified_type = field.children[0]
-        type_parts = [child.value for child in qualified_type.children
-                     if hasattr(child, 'value') and child.value != '::']
-
-        # Extract field name
-        field_name = field.children[1].value
+        # Extract qualified type segments (:: separators dropped) and field name
+        extractor = NamespaceExtractor()
+        extractor.transform(tree)
+        type_parts, field_name = extractor.qualified_fields[0]
 
         if type_parts == ['common', 'geometry', 'Vector3'] and field_name == 'pos':
             print(f"✓ qualified type extraction: type={type_parts}, field={field_name}")
@@ -328,29 +311,7 @@ def test_qualified_type_extraction():
 
 def test_invalid_namespace_syntax():
     """Test that invalid namespace syntax is rejected."""
-    parser = load_parser()
-
-    invalid_tests = [
-        ('using namespace', 'missing namespace name'),
-        ('namespace = common::geometry', 'missing alias name'),
-        ('namespace cg = ', 'missing target namespace'),
-    ]
-
-    passed = 0
-    failed = 0
-
-    for code_line, description in invalid_tests:
-        code = f"{code_line}\n"
-        try:
-            processed = preprocess(code)
-            tree = parser.parse(processed)
-            print(f"✗ {description} - should have been rejected!")
-            failed += 1
-        except LarkError:
-            print(f"✓ {description} - correctly rejected")
-            passed += 1
-
-    return passed, failed
+    return check_rejected(load_parser(), _INVALID_NS_CASES, prepare=preprocess)
 
 
 def main():
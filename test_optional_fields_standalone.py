@@ -3,50 +3,102 @@
 Standalone test for optional field modifier - no pytest required.
 """
 
-from lark import Lark
+from lark import Token, Transformer, v_args
 from lark.exceptions import LarkError
-from pathlib import Path
-from indentation_preprocessor import IndentationPreprocessor
 
+from standalone_utils import collect, parse_snippet, subtrees_named
 
-def load_parser():
-    """Load the grammar file and create parser."""
-    grammar_file = Path("grammar/message.lark")
 
-    with open(grammar_file) as f:
-        grammar = f.read()
+# IDL snippets used by the tests below, keyed by test name
+_SNIPPETS = {
+    "optional_primitive_field": """struct Test
+    optional uint32 id
+    float64 value
+""",
+    "optional_user_type_field": """struct Test
+    optional Vector3 position
+    Vector3 velocity
+""",
+    "optional_qualified_type_field": """struct Test
+    optional common::geometry::Vector3 position
+    common::geometry::Vector3 velocity
+""",
+    "optional_with_inline_attributes": """struct Test
+    optional uint32 id @description("Optional ID"), @default(0)
+""",
+    "optional_with_indented_attributes": """struct Test
+    optional float64 value
+        description: "Optional value"
+        default: 0.0
+""",
+    "optional_with_both_attribute_types": """struct Test
+    optional uint32 id @primary(true)
+        description: "Primary key"
+        auto_increment: true
+""",
+    "mixed_optional_and_required": """struct Data
+    uint32 required_id
+    optional string optional_name
+    float64 required_value
+    optional Vector3 optional_position
+""",
+    "all_optional_fields": """struct AllOptional
+    optional uint32 a
+    optional float64 b
+    optional Vector3 c
+""",
+    "optional_extraction": """struct Test
+    optional uint32 opt_field
+    uint32 req_field
+""",
+    "backwards_compatibility": """struct Legacy
+    uint32 id
+    float64 value
+    Vector3 position
+""",
+}
 
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
 
+def is_optional(field):
+    """Check if a field has the optional modifier."""
+    first = field.children[0]
+    return type(first) is Token and first.type == "OPTIONAL"
 
-def preprocess(code):
-    """Preprocess indentation."""
-    preprocessor = IndentationPreprocessor()
-    return preprocessor.process(code)
 
+# Every rule that represents a struct field
+FIELD_RULES = frozenset({"struct_field", "user_type_field", "qualified_type_field"})
 
-def is_optional(field):
-    """Check if a field has the optional modifier."""
-    return field.children[0].type == "OPTIONAL" if hasattr(field.children[0], "type") else False
 
+def all_field_nodes(tree):
+    """Return all field nodes, whatever their type kind, in a single tree walk."""
+    return [node for node in tree.iter_subtrees() if node.data in FIELD_RULES]
 
-def test_optional_primitive_field():
-    """Test optional with primitive type."""
-    parser = load_parser()
 
-    code = """struct Test
-    optional uint32 id
-    float64 value
-"""
+class FieldExtractor(Transformer):
+    """Collect (field_name, is_optional) for primitive fields in one pass."""
+
+    def __init__(self):
+        super().__init__()
+        self.fields = []
 
+    @v_args(tree=True)
+    def struct_field(self, tree):
+        optional = is_optional(tree)
+        # Field name follows the type, which follows the OPTIONAL token if present
+        name_index = 2 if optional else 1
+        self.fields.append((tree.children[name_index].value, optional))
+        return tree
+
+
+def test_optional_primitive_field():
+    """Test optional with primitive type."""
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["optional_primitive_field"])
 
-        fields = list(tree.find_data("struct_field"))
+        fields = subtrees_named(tree, "struct_field")
 
         if len(fields) == 2 and is_optional(fields[0]) and not is_optional(fields[1]):
             print("✓ optional primitive field")
@@ -63,21 +115,13 @@ def test_optional_primitive_field():
 
 def test_optional_user_type_field():
     """Test optional with user-defined type."""
-    parser = load_parser()
-
-    code = """struct Test
-    optional Vector3 position
-    Vector3 velocity
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["optional_user_type_field"])
 
-        fields = list(tree.find_data("user_type_field"))
+        fields = subtrees_named(tree, "user_type_field")
 
         if len(fields) == 2 and is_optional(fields[0]) and not is_optional(fields[1]):
             print("✓ optional user-defined type")
@@ -94,21 +138,13 @@ def test_optional_user_type_field():
 
 def test_optional_qualified_type_field():
     """Test optional with qualified type."""
-    parser = load_parser()
-
-    code = """struct Test
-    optional common::geometry::Vector3 position
-    common::geometry::Vector3 velocity
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["optional_qualified_type_field"])
 
-        fields = list(tree.find_data("qualified_type_field"))
+        fields = subtrees_named(tree, "qualified_type_field")
 
         if len(fields) == 2 and is_optional(fields[0]) and not is_optional(fields[1]):
             print("✓ optional qualified type")
@@ -125,21 +161,15 @@ def test_optional_qualified_type_field():
 
 def test_optional_with_inline_attributes():
     """Test optional field with inline attributes."""
-    parser = load_parser()
-
-    code = """struct Test
-    optional uint32 id @description("Optional ID"), @default(0)
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["optional_with_inline_attributes"])
 
-        fields = list(tree.find_data("struct_field"))
-        inline_attrs = list(tree.find_data("inline_attribute"))
+        found = collect(tree, ("struct_field", "inline_attribute"))
+        fields = found["struct_field"]
+        inline_attrs = found["inline_attribute"]
 
         if len(fields) == 1 and is_optional(fields[0]) and len(inline_attrs) == 2:
             print("✓ optional with inline attributes")
@@ -156,23 +186,15 @@ def test_optional_with_inline_attributes():
 
 def test_optional_with_indented_attributes():
     """Test optional field with indented attributes."""
-    parser = load_parser()
-
-    code = """struct Test
-    optional float64 value
-        description: "Optional value"
-        default: 0.0
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["optional_with_indented_attributes"])
 
-        fields = list(tree.find_data("struct_field"))
-        field_attrs = list(tree.find_data("field_attributes"))
+        found = collect(tree, ("struct_field", "field_attributes"))
+        fields = found["struct_field"]
+        field_attrs = found["field_attributes"]
 
         if len(fields) == 1 and is_optional(fields[0]) and len(field_attrs) == 1:
             print("✓ optional with indented attributes")
@@ -189,24 +211,16 @@ def test_optional_with_indented_attributes():
 
 def test_optional_with_both_attribute_types():
     """Test optional field with both inline and indented attributes."""
-    parser = load_parser()
-
-    code = """struct Test
-    optional uint32 id @primary(true)
-        description: "Primary key"
-        auto_increment: true
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["optional_with_both_attribute_types"])
 
-        fields = list(tree.find_data("struct_field"))
-        inline_attrs = list(tree.find_data("inline_attribute"))
-        field_attrs = list(tree.find_data("field_attributes"))
+        found = collect(tree, ("struct_field", "inline_attribute", "field_attributes"))
+        fields = found["struct_field"]
+        inline_attrs = found["inline_attribute"]
+        field_attrs = found["field_attributes"]
 
         if len(fields) == 1 and is_optional(fields[0]) and \
            len(inline_attrs) == 1 and len(field_attrs) == 1:
@@ -224,28 +238,17 @@ def test_optional_with_both_attribute_types():
 
 def test_mixed_optional_and_required():
     """Test struct with mix of optional and required fields."""
-    parser = load_parser()
-
-    code = """struct Data
-    uint32 required_id
-    optional string optional_name
-    float64 required_value
-    optional Vector3 optional_position
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["mixed_optional_and_required"])
 
-        all_fields = list(tree.find_data("struct_field")) + \
-                     list(tree.find_data("user_type_field")) + \
-                     list(tree.find_data("qualified_type_field"))
+        all_fields = all_field_nodes(tree)
 
-        optional_count = sum(1 for f in all_fields if is_optional(f))
-        required_count = len(all_fields) - optional_count
+        opt_flags = [is_optional(f) for f in all_fields]
+        optional_count = sum(opt_flags)
+        required_count = len(opt_flags) - optional_count
 
         if len(all_fields) == 4 and optional_count == 2 and required_count == 2:
             print(f"✓ mixed optional ({optional_count}) and required ({required_count})")
@@ -262,26 +265,16 @@ def test_mixed_optional_and_required():
 
 def test_all_optional_fields():
     """Test struct where all fields are optional."""
-    parser = load_parser()
-
-    code = """struct AllOptional
-    optional uint32 a
-    optional float64 b
-    optional Vector3 c
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["all_optional_fields"])
 
-        all_fields = list(tree.find_data("struct_field")) + \
-                     list(tree.find_data("user_type_field")) + \
-                     list(tree.find_data("qualified_type_field"))
+        all_fields = all_field_nodes(tree)
 
-        all_optional = all(is_optional(f) for f in all_fields)
+        opt_flags = [is_optional(f) for f in all_fields]
+        all_optional = all(opt_flags)
 
         if len(all_fields) == 3 and all_optional:
             print("✓ all fields optional")
@@ -298,38 +291,17 @@ def test_all_optional_fields():
 
 def test_optional_extraction():
     """Test extracting optional modifier from AST."""
-    parser = load_parser()
-
-    code = """struct Test
-    optional uint32 opt_field
-    uint32 req_field
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
-
-        fields = list(tree.find_data("struct_field"))
+        tree = parse_snippet(_SNIPPETS["optional_extraction"])
 
-        # Extract details from first field (optional)
-        field1 = fields[0]
-        has_optional1 = is_optional(field1)
+        extractor = FieldExtractor()
+        extractor.transform(tree)
 
-        # Extract field name - need to account for optional token
-        if has_optional1:
-            # OPTIONAL, primitive_type, CNAME, ...
-            field_name1 = field1.children[2].value
-        else:
-            # primitive_type, CNAME, ...
-            field_name1 = field1.children[1].value
-
-        # Second field (required)
-        field2 = fields[1]
-        has_optional2 = is_optional(field2)
-        field_name2 = field2.children[1].value if not has_optional2 else field2.children[2].value
+        # First field is optional, second is required
+        (field_name1, has_optional1), (field_name2, has_optional2) = extractor.fields
 
         if has_optional1 and not has_optional2 and \
            field_name1 == "opt_field" and field_name2 == "req_field":
@@ -349,26 +321,16 @@ def test_optional_extraction():
 
 def test_backwards_compatibility():
     """Test that structs without optional still work."""
-    parser = load_parser()
-
-    code = """struct Legacy
-    uint32 id
-    float64 value
-    Vector3 position
-"""
-
     passed = 0
     failed = 0
 
     try:
-        processed = preprocess(code)
-        tree = parser.parse(processed)
+        tree = parse_snippet(_SNIPPETS["backwards_compatibility"])
 
-        all_fields = list(tree.find_data("struct_field")) + \
-                     list(tree.find_data("user_type_field")) + \
-                     list(tree.find_data("qualified_type_field"))
+        all_fields = all_field_nodes(tree)
 
-        any_optional = any(is_optional(f) for f in all_fields)
+        opt_flags = [is_optional(f) for f in all_fields]
+        any_optional = any(opt_flags)
 
         if len(all_fields) == 3 and not any_optional:
             print("✓ backwards compatible (no optional keyword)")
@@ -3,20 +3,29 @@
 Test the new lumos_idl package structure.
 """
 
-from lumos_idl import IDLProcessor, Config
+from lumos_idl import IDLProcessor, Config, ParserConfig
 
 
-def test_simple_parse():
-    """Test parsing a simple struct."""
-    processor = IDLProcessor()
+# One processor (and so one parser build) shared by every test
+PROCESSOR = IDLProcessor()
 
-    code = """struct Point
+POINT_STRUCT = """struct Point
     float32 x
     float32 y
     float32 z
 """
 
-    result = processor.parse_string(code)
+ALIASED_STRUCT = """using Meters = float32
+
+struct Point
+    Meters x
+    Meters y
+"""
+
+
+def test_simple_parse():
+    """Test parsing a simple struct."""
+    result = PROCESSOR.parse_string(POINT_STRUCT)
 
     if result.success:
         print("✓ Simple struct parsing works")
@@ -30,9 +39,7 @@ def test_simple_parse():
 
 def test_parse_file():
     """Test parsing an actual file."""
-    processor = IDLProcessor()
-
-    result = processor.parse_file("tests/test_files/valid/interface_example.msg")
+    result = PROCESSOR.parse_file("tests/test_files/valid/interface_example.msg")
 
     if result.success:
         print("✓ File parsing works")
@@ -59,21 +66,22 @@ def test_config():
     assert config.validation.max_field_number == 536870911
     print("✓ Config properties accessible")
 
+    # Test that an unknown parser algorithm is rejected up front
+    try:
+        ParserConfig(algorithm="bogus")
+    except ValueError:
+        print("✓ Unknown parser algorithm rejected")
+    else:
+        print("✗ Unknown parser algorithm accepted")
+        return False
+
     return True
 
 
 def test_process_file():
     """Test the process_file method (parse + validate)."""
-    processor = IDLProcessor()
-
     # Use a simple file that doesn't have undefined type references
-    code = """struct Point
-    float32 x
-    float32 y
-    float32 z
-"""
-
-    result = processor.process_string(code, "test.msg")
+    result = PROCESSOR.process_string(POINT_STRUCT)
 
     if result.success:
         print("✓ Process file works")
@@ -85,6 +93,23 @@ def test_process_file():
         return False
 
 
+def test_validate_twice():
+    """Test that validating the same ParseResult again is repeatable."""
+    parse_result = PROCESSOR.parse_string(ALIASED_STRUCT)
+    PROCESSOR.validate(parse_result)
+    result = PROCESSOR.validate(parse_result)
+
+    counts = [(len(file_info.defined_types), len(file_info.defined_aliases))
+              for file_info in result.parsed_files.values()]
+    if result.success and counts == [(1, 1)]:
+        print("✓ Repeated validation works")
+        return True
+    else:
+        print(f"✗ Repeated validation changed defined types/aliases: {counts}")
+        result.print_errors()
+        return False
+
+
 def main():
     """Run all tests."""
     print("=" * 70)
@@ -97,6 +122,7 @@ def main():
         ("Simple Parse", test_simple_parse),
         ("Parse File", test_parse_file),
         ("Process File", test_process_file),
+        ("Validate Twice", test_validate_twice),
     ]
 
     passed = 0
@@ -1,28 +1,17 @@
 #!/usr/bin/env python3.9
 """
 Standalone test for struct definition parsing - no pytest required.
-"""
-
-from lark import Lark
-from lark.exceptions import LarkError
-from pathlib import Path
-from indentation_preprocessor import IndentationPreprocessor
-
-
-def load_parser():
-    """Load the grammar file and create parser."""
-    grammar_file = Path("grammar/message.lark")
 
-    with open(grammar_file) as f:
-        grammar = f.read()
-
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
+Set LUMOS_USE_CYTHON=1 to parse with lark_cython when it is installed.
+"""
 
+from lark.exceptions import LarkError, UnexpectedToken
 
-def preprocess(code):
-    """Preprocess indentation."""
-    preprocessor = IndentationPreprocessor()
-    return preprocessor.process(code)
+from standalone_utils import (
+    check_rejected, child_trees, load_parser, load_recognizer, parse_all, preprocess, rule_counts,
+    run_buffered,
+)
+from tests.tree_utils import count_data
 
 
 def test_user_example():
@@ -47,12 +36,12 @@ def test_user_example():
     try:
         processed = preprocess(code)
         tree = parser.parse(processed)
-        struct_defs = list(tree.find_data("struct_def"))
-        if len(struct_defs) == 1:
+        struct_defs = count_data(tree, "struct_def")
+        if struct_defs == 1:
             print("✓ User example struct with [attributes] block")
             passed += 1
         else:
-            print(f"✗ User example: expected 1 struct, got {len(struct_defs)}")
+            print(f"✗ User example: expected 1 struct, got {struct_defs}")
             failed += 1
     except LarkError as e:
         print(f"✗ User example failed: {e}")
@@ -63,8 +52,6 @@ def test_user_example():
 
 def test_simple_structs():
     """Test simple struct definitions."""
-    parser = load_parser()
-
     valid_tests = [
         ("""struct Point
     float32 x
@@ -85,14 +72,12 @@ def test_simple_structs():
     passed = 0
     failed = 0
 
-    for code, description in valid_tests:
-        try:
-            processed = preprocess(code)
-            tree = parser.parse(processed)
+    for description, error in parse_all(valid_tests, "struct_def", preprocess):
+        if error is None:
             print(f"✓ {description}")
             passed += 1
-        except LarkError as e:
-            print(f"✗ {description}: {e}")
+        else:
+            print(f"✗ {description}: {error}")
             failed += 1
 
     return passed, failed
@@ -116,12 +101,12 @@ def test_struct_with_attributes():
     try:
         processed = preprocess(code)
         tree = parser.parse(processed)
-        struct_attrs = list(tree.find_data("struct_attributes"))
-        if len(struct_attrs) == 1:
+        struct_attrs = count_data(tree, "struct_attributes")
+        if struct_attrs == 1:
             print("✓ Struct with [attributes] block")
             passed += 1
         else:
-            print(f"✗ Attributes: expected 1 block, got {len(struct_attrs)}")
+            print(f"✗ Attributes: expected 1 block, got {struct_attrs}")
             failed += 1
     except LarkError as e:
         print(f"✗ Struct with attributes failed: {e}")
@@ -148,12 +133,12 @@ def test_field_attributes():
     try:
         processed = preprocess(code)
         tree = parser.parse(processed)
-        field_attrs = list(tree.find_data("field_attributes"))
-        if len(field_attrs) == 2:
+        field_attrs = count_data(tree, "field_attributes")
+        if field_attrs == 2:
             print("✓ Fields with attribute blocks")
             passed += 1
         else:
-            print(f"✗ Field attributes: expected 2, got {len(field_attrs)}")
+            print(f"✗ Field attributes: expected 2, got {field_attrs}")
             failed += 1
     except LarkError as e:
         print(f"✗ Field attributes failed: {e}")
@@ -162,10 +147,13 @@ def test_field_attributes():
     return passed, failed
 
 
+# Wraps one struct-level attribute line in a minimal struct
+_ATTR_STRUCT_PREFIX = "struct Test\n    [attributes]\n        "
+_ATTR_STRUCT_SUFFIX = "\n    uint32 value\n"
+
+
 def test_attribute_value_types():
     """Test all attribute value types."""
-    parser = load_parser()
-
     tests = [
         ('packed: true', 'boolean true'),
         ('enabled: false', 'boolean false'),
@@ -177,19 +165,15 @@ def test_attribute_value_types():
     passed = 0
     failed = 0
 
-    for attr_line, description in tests:
-        code = f"""struct Test
-    [attributes]
-        {attr_line}
-    uint32 value
-"""
-        try:
-            processed = preprocess(code)
-            tree = parser.parse(processed)
+    cases = [(_ATTR_STRUCT_PREFIX + attr_line + _ATTR_STRUCT_SUFFIX, description)
+             for attr_line, description in tests]
+
+    for description, error in parse_all(cases, "struct_def", preprocess):
+        if error is None:
             print(f"✓ attribute {description}")
             passed += 1
-        except LarkError as e:
-            print(f"✗ attribute {description}: {e}")
+        else:
+            print(f"✗ attribute {description}: {error}")
             failed += 1
 
     return passed, failed
@@ -215,14 +199,14 @@ struct Transform
     try:
         processed = preprocess(code)
         tree = parser.parse(processed)
-        structs = list(tree.find_data("struct_def"))
-        user_type_fields = list(tree.find_data("user_type_field"))
+        structs = count_data(tree, "struct_def")
+        user_type_fields = count_data(tree, "user_type_field")
 
-        if len(structs) == 2 and len(user_type_fields) == 2:
+        if structs == 2 and user_type_fields == 2:
             print("✓ User-defined types in fields")
             passed += 1
         else:
-            print(f"✗ User types: got {len(structs)} structs, {len(user_type_fields)} user fields")
+            print(f"✗ User types: got {structs} structs, {user_type_fields} user fields")
             failed += 1
     except LarkError as e:
         print(f"✗ User-defined types failed: {e}")
@@ -233,30 +217,16 @@ struct Transform
 
 def test_invalid_structs():
     """Test invalid struct cases."""
-    parser = load_parser()
-
+    # (code, description, expected error, (line, column) it is reported at)
     invalid_tests = [
-        ("struct Empty\n", "empty struct (no fields)"),
+        ("struct Empty\n", "empty struct (no fields)", UnexpectedToken, (1, 13)),
         ("""struct Test
     [attributes]
     float32 value
-""", "empty attributes block"),
+""", "empty attributes block", UnexpectedToken, (4, 1)),
     ]
 
-    passed = 0
-    failed = 0
-
-    for code, description in invalid_tests:
-        try:
-            processed = preprocess(code)
-            tree = parser.parse(processed)
-            print(f"✗ {description} - should have been rejected!")
-            failed += 1
-        except LarkError:
-            print(f"✓ {description} - correctly rejected")
-            passed += 1
-
-    return passed, failed
+    return check_rejected(load_recognizer(), invalid_tests, prepare=preprocess)
 
 
 def test_mixed_content():
@@ -284,16 +254,17 @@ struct Data
     try:
         processed = preprocess(code)
         tree = parser.parse(processed)
-        imports = list(tree.find_data("import_stmt"))
-        aliases = list(tree.find_data("using_def"))
-        constants = list(tree.find_data("const_def"))
-        structs = list(tree.find_data("struct_def"))
+        counts = rule_counts(tree)
+        imports = counts["import_stmt"]
+        aliases = counts["using_def"]
+        constants = counts["const_def"]
+        structs = counts["struct_def"]
 
-        if len(imports) == 1 and len(aliases) == 1 and len(constants) == 1 and len(structs) == 2:
+        if imports == 1 and aliases == 1 and constants == 1 and structs == 2:
             print("✓ Mixed content with structs")
             passed += 1
         else:
-            print(f"✗ Mixed: got {len(imports)}, {len(aliases)}, {len(constants)}, {len(structs)}")
+            print(f"✗ Mixed: got {imports}, {aliases}, {constants}, {structs}")
             failed += 1
     except LarkError as e:
         print(f"✗ Mixed content failed: {e}")
@@ -317,19 +288,20 @@ def test_struct_extraction():
     try:
         processed = preprocess(code)
         tree = parser.parse(processed)
-        struct_def = list(tree.find_data("struct_def"))[0]
+        struct_def = next(child_trees(tree, "struct_def"))
 
         # Extract struct name (children[1], children[0] is STRUCT token)
         name = struct_def.children[1].value
 
         # Count fields (they're inside struct_body now)
-        fields = list(tree.find_data("struct_field"))
+        struct_body = next(child_trees(struct_def, "struct_body"))
+        fields = sum(1 for _ in child_trees(struct_body, "struct_field"))
 
-        if name == "Point" and len(fields) == 2:
-            print(f"✓ extraction: struct {name} with {len(fields)} fields")
+        if name == "Point" and fields == 2:
+            print(f"✓ extraction: struct {name} with {fields} fields")
             passed += 1
         else:
-            print(f"✗ extraction failed: got {name} with {len(fields)} fields")
+            print(f"✗ extraction failed: got {name} with {fields} fields")
             failed += 1
     except Exception as e:
         print(f"✗ extraction failed: {e}")
@@ -392,8 +364,8 @@ def main():
     print()
     print("=" * 70)
 
-    total_pass = sum(p for p, f in results)
-    total_fail = sum(f for p, f in results)
+    # Sum both columns of the (passed, failed) pairs in a single pass
+    total_pass, total_fail = map(sum, zip(*results))
     total = total_pass + total_fail
 
     print(f"Results: {total_pass}/{total} tests passed")
@@ -407,4 +379,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
+    exit(run_buffered(main))
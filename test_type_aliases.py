@@ -6,12 +6,17 @@ Test type alias functionality.
 from lumos_idl import IDLProcessor
 
 
+# One processor shared by every test; validate() clears the symbol table
+# and error reporter at the start of each run, so no reset is needed
+PROCESSOR = IDLProcessor()
+
+
 def test_simple_alias():
     """Test simple type alias."""
     print("Test 1: Simple type alias")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """using Timestamp = uint64
 
@@ -44,7 +49,7 @@ def test_multiple_aliases():
     print("\nTest 2: Multiple type aliases")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """using GPSCoordinate = float64
 using Timestamp = uint64
@@ -77,7 +82,7 @@ def test_alias_all_primitive_types():
     print("\nTest 3: Aliases to all primitive types")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """using MyBool = bool
 using MyInt8 = int8
@@ -123,7 +128,7 @@ def test_alias_unused():
     print("\nTest 4: Unused alias")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """using Timestamp = uint64
 
@@ -147,7 +152,7 @@ def test_alias_in_optional_field():
     print("\nTest 5: Alias in optional field")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """using Timestamp = uint64
 
@@ -172,7 +177,7 @@ def test_alias_with_field_numbers():
     print("\nTest 6: Alias with field numbers")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """using Timestamp = uint64
 
@@ -197,7 +202,7 @@ def test_alias_same_name_as_type():
     print("\nTest 7: Alias with same name as type")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """struct Point
     float32 x
@@ -240,15 +245,22 @@ def main():
     ]
 
     results = []
+    failures = []
     for test in tests:
         try:
             results.append(test())
         except Exception as e:
             print(f"\n✗ Test failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
+            failures.append((test.__name__, e))
             results.append(False)
 
+    # Format tracebacks only after every test has run
+    if failures:
+        import traceback
+        for name, exc in failures:
+            print(f"\nTraceback for {name}:")
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+
     print()
     print("=" * 70)
     passed = sum(results)
@@ -1,21 +1,16 @@
 #!/usr/bin/env python3.9
 """
 Standalone test for type alias (using) parsing - no pytest required.
-"""
-
-from lark import Lark
-from lark.exceptions import LarkError
-from pathlib import Path
 
+Set LUMOS_USE_CYTHON=1 to parse with lark_cython when it is installed.
+"""
 
-def load_parser():
-    """Load the grammar file and create parser."""
-    grammar_file = Path("grammar/message.lark")
-
-    with open(grammar_file) as f:
-        grammar = f.read()
+from lark.exceptions import LarkError, UnexpectedToken
 
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
+from standalone_utils import (
+    check_rejected, child_trees, load_parser, load_recognizer, parse_all, rule_counts, run_buffered,
+)
+from tests.tree_utils import count_data
 
 
 def test_user_examples():
@@ -32,12 +27,12 @@ using DeviceId = uint32
 
     try:
         tree = parser.parse(code)
-        using_defs = list(tree.find_data("using_def"))
-        if len(using_defs) == 3:
+        using_defs = count_data(tree, "using_def")
+        if using_defs == 3:
             print("✓ User example type aliases (all 3 parsed)")
             passed += 1
         else:
-            print(f"✗ User examples: expected 3 aliases, got {len(using_defs)}")
+            print(f"✗ User examples: expected 3 aliases, got {using_defs}")
             failed += 1
     except LarkError as e:
         print(f"✗ User examples failed: {e}")
@@ -48,8 +43,6 @@ using DeviceId = uint32
 
 def test_valid_aliases():
     """Test valid type alias cases."""
-    parser = load_parser()
-
     valid_tests = [
         ("using Timestamp = uint64\n", "simple alias"),
         ("using Temperature = float32\n", "float alias"),
@@ -62,13 +55,12 @@ def test_valid_aliases():
     passed = 0
     failed = 0
 
-    for code, description in valid_tests:
-        try:
-            tree = parser.parse(code)
+    for description, error in parse_all(valid_tests, "using_def"):
+        if error is None:
             print(f"✓ {description}")
             passed += 1
-        except LarkError as e:
-            print(f"✗ {description}: {e}")
+        else:
+            print(f"✗ {description}: {error}")
             failed += 1
 
     return passed, failed
@@ -76,8 +68,6 @@ def test_valid_aliases():
 
 def test_all_primitive_types():
     """Test aliasing all primitive types."""
-    parser = load_parser()
-
     types = [
         "bool", "int8", "int16", "int32", "int64",
         "uint8", "uint16", "uint32", "uint64",
@@ -87,14 +77,14 @@ def test_all_primitive_types():
     passed = 0
     failed = 0
 
-    for ptype in types:
-        code = f"using MyType = {ptype}\n"
-        try:
-            tree = parser.parse(code)
+    cases = [(f"using MyType = {ptype}\n", ptype) for ptype in types]
+
+    for ptype, error in parse_all(cases, "using_def"):
+        if error is None:
             print(f"✓ alias for {ptype}")
             passed += 1
-        except LarkError as e:
-            print(f"✗ alias for {ptype}: {e}")
+        else:
+            print(f"✗ alias for {ptype}: {error}")
             failed += 1
 
     return passed, failed
@@ -102,29 +92,16 @@ def test_all_primitive_types():
 
 def test_invalid_aliases():
     """Test invalid type alias cases - these should fail."""
-    parser = load_parser()
-
+    # (code, description, expected error, (line, column) it is reported at)
     invalid_tests = [
-        ("using Timestamp =\n", "missing type"),
-        ("using Timestamp uint64\n", "missing equals"),
-        ("using = uint64\n", "missing name"),
-        ("using Timestamp = string\n", "invalid type"),
-        ("using Timestamp = MyCustomType\n", "unknown type"),
+        ("using Timestamp =\n", "missing type", UnexpectedToken, (1, 17)),
+        ("using Timestamp uint64\n", "missing equals", UnexpectedToken, (1, 17)),
+        ("using = uint64\n", "missing name", UnexpectedToken, (1, 7)),
+        ("using Timestamp = string\n", "invalid type", UnexpectedToken, (1, 19)),
+        ("using Timestamp = MyCustomType\n", "unknown type", UnexpectedToken, (1, 19)),
     ]
 
-    passed = 0
-    failed = 0
-
-    for code, description in invalid_tests:
-        try:
-            tree = parser.parse(code)
-            print(f"✗ {description} - should have been rejected!")
-            failed += 1
-        except LarkError:
-            print(f"✓ {description} - correctly rejected")
-            passed += 1
-
-    return passed, failed
+    return check_rejected(load_recognizer(), invalid_tests)
 
 
 def test_mixed_content():
@@ -148,16 +125,17 @@ const float32 THRESHOLD = 0.5
 
     try:
         tree = parser.parse(code)
-        imports = list(tree.find_data("import_stmt"))
-        aliases = list(tree.find_data("using_def"))
-        constants = list(tree.find_data("const_def"))
+        counts = rule_counts(tree)
+        imports = counts["import_stmt"]
+        aliases = counts["using_def"]
+        constants = counts["const_def"]
 
-        if len(imports) == 1 and len(aliases) == 3 and len(constants) == 2:
+        if imports == 1 and aliases == 3 and constants == 2:
             print("✓ Mixed imports, aliases, and constants")
             passed += 1
         else:
             print(f"✗ Mixed content: expected 1 import, 3 aliases, 2 constants")
-            print(f"   got {len(imports)}, {len(aliases)}, {len(constants)}")
+            print(f"   got {imports}, {aliases}, {constants}")
             failed += 1
     except LarkError as e:
         print(f"✗ Mixed content failed: {e}")
@@ -182,7 +160,7 @@ def test_alias_extraction():
     for code, exp_name, exp_type in tests:
         try:
             tree = parser.parse(code)
-            using_def = list(tree.find_data("using_def"))[0]
+            using_def = next(child_trees(tree, "using_def"))
 
             # Extract details from AST
             # using_def children: [CNAME, primitive_type, NEWLINE]
@@ -220,13 +198,13 @@ using SensorId = uint16
 
     try:
         tree = parser.parse(code)
-        using_defs = list(tree.find_data("using_def"))
+        using_defs = count_data(tree, "using_def")
 
-        if len(using_defs) == 5:
+        if using_defs == 5:
             print("✓ Multiple type aliases (5 total)")
             passed += 1
         else:
-            print(f"✗ Multiple aliases: expected 5, got {len(using_defs)}")
+            print(f"✗ Multiple aliases: expected 5, got {using_defs}")
             failed += 1
     except LarkError as e:
         print(f"✗ Multiple aliases failed: {e}")
@@ -279,8 +257,8 @@ def main():
     print()
     print("=" * 70)
 
-    total_pass = sum(p for p, f in results)
-    total_fail = sum(f for p, f in results)
+    # Sum both columns of the (passed, failed) pairs in a single pass
+    total_pass, total_fail = map(sum, zip(*results))
     total = total_pass + total_fail
 
     print(f"Results: {total_pass}/{total} tests passed")
@@ -294,4 +272,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
+    exit(run_buffered(main))
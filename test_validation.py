@@ -6,12 +6,17 @@ Test basic validation functionality.
 from lumos_idl import IDLProcessor
 
 
+# One processor shared by every test; validate() clears the symbol table
+# and error reporter at the start of each run, so no reset is needed
+PROCESSOR = IDLProcessor()
+
+
 def test_valid_struct():
     """Test validation of a valid struct."""
     print("Test 1: Valid struct with primitive types")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """struct Point
     float32 x
@@ -38,7 +43,7 @@ def test_invalid_type_reference():
     print("\nTest 2: Invalid type reference")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """struct Transform
     Vector3 position
@@ -63,7 +68,7 @@ def test_valid_with_user_types():
     print("\nTest 3: Valid user-defined types")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """struct Vector3
     float32 x
@@ -95,7 +100,7 @@ def test_interface_validation():
     print("\nTest 4: Interface validation")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """interface SensorData
     uint32 id : 0
@@ -124,7 +129,7 @@ def test_optional_fields():
     print("\nTest 5: Optional fields")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """struct Config
     string name
@@ -153,7 +158,7 @@ def test_symbol_table():
     print("\nTest 6: Symbol table")
     print("-" * 70)
 
-    processor = IDLProcessor()
+    processor = PROCESSOR
 
     code = """struct Point
     float32 x
@@ -208,15 +213,22 @@ def main():
     ]
 
     results = []
+    failures = []
     for test in tests:
         try:
             results.append(test())
         except Exception as e:
             print(f"\n✗ Test failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
+            failures.append((test.__name__, e))
             results.append(False)
 
+    # Format tracebacks only after every test has run
+    if failures:
+        import traceback
+        for name, exc in failures:
+            print(f"\nTraceback for {name}:")
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+
     print()
     print("=" * 70)
     passed = sum(results)
@@ -0,0 +1,65 @@
+"""
+Shared pytest fixtures for the LumosInterface test suite.
+"""
+
+import functools
+import os
+import pytest
+from pathlib import Path
+
+from .parser_factory import (
+    GRAMMAR_FILE, GRAMMAR_SOURCE, build_parser, build_positioned_parser, build_strict_parser,
+)
+
+
+TEST_DIR = Path(__file__).parent / "test_files"
+
+
+@pytest.fixture(scope="session")
+def parser():
+    """Load the grammar and create one parser instance for the whole session."""
+    if GRAMMAR_SOURCE is None:
+        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
+
+    return build_parser()
+
+
+@pytest.fixture(scope="session")
+def positioned_parser():
+    """Parser for tests that read line/column metadata from tree nodes."""
+    if GRAMMAR_SOURCE is None:
+        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
+
+    return build_positioned_parser()
+
+
+@pytest.fixture(scope="session")
+def strict_parser():
+    """Parser for tests that only check input is rejected (no trees inspected)."""
+    if GRAMMAR_SOURCE is None:
+        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
+
+    return build_strict_parser()
+
+
+@pytest.fixture(scope="session")
+def cached_parse(parser):
+    """parser.parse memoized on the source text for the whole session.
+
+    Only for tests that read the resulting tree; cache hits return the same
+    Tree object, so it must not be modified.
+    """
+    return functools.lru_cache(maxsize=256)(parser.parse)
+
+
+@pytest.fixture(scope="session")
+def msg_contents():
+    """Read every valid and invalid .msg test file once, keyed by path."""
+    contents = {}
+    for subdir in ("valid", "invalid"):
+        # One scan per directory; DirEntry names need no extra stat to filter
+        with os.scandir(TEST_DIR / subdir) as entries:
+            paths = [Path(entry.path) for entry in entries if entry.name.endswith(".msg")]
+        for path in paths:
+            contents[path] = path.read_text(encoding="utf-8")
+    return contents
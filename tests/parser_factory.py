@@ -0,0 +1,60 @@
+"""
+Parser construction shared by the pytest suite and the standalone runner.
+
+Kept free of pytest imports so run_simple_test.py can use it directly.
+"""
+
+import os
+from pathlib import Path
+from lark import Lark
+
+
+GRAMMAR_FILE = Path(__file__).parent.parent / "grammar" / "message.lark"
+
+# Grammar text, read once at import; None when the grammar file is missing
+GRAMMAR_SOURCE = GRAMMAR_FILE.read_text(encoding="utf-8") if GRAMMAR_FILE.exists() else None
+
+# Pickled LALR tables; Lark rebuilds the file when the grammar or options change,
+# so each parser configuration gets its own file. LUMOS_LARK_CACHE_DIR moves them
+# somewhere CI can persist between runs.
+PARSER_CACHE_DIR = Path(os.environ.get("LUMOS_LARK_CACHE_DIR", Path(__file__).parent.parent / ".lark_cache"))
+PARSER_CACHE_FILE = PARSER_CACHE_DIR / "message.lark.tests.cache"
+POSITIONED_PARSER_CACHE_FILE = PARSER_CACHE_DIR / "message.lark.positions.cache"
+STRICT_PARSER_CACHE_FILE = PARSER_CACHE_DIR / "message.lark.strict.cache"
+
+
+def _cython_plugins():
+    """Return lark_cython's plugins if LUMOS_USE_CYTHON=1 and it is installed, else None."""
+    if os.environ.get("LUMOS_USE_CYTHON") != "1":
+        return None
+    try:
+        import lark_cython
+    except ImportError:
+        return None
+    return lark_cython.plugins
+
+
+def build_lalr_parser(cache_file: Path, **options) -> Lark:
+    """Create an LALR parser from the grammar source with extra options."""
+    plugins = _cython_plugins()
+    if plugins is not None:
+        # Keep Cython-driven parsers out of the cache files the pure-Python ones use
+        return Lark(GRAMMAR_SOURCE, parser="lalr", start="start", _plugins=plugins, **options)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    return Lark(GRAMMAR_SOURCE, parser="lalr", start="start", cache=str(cache_file), **options)
+
+
+def build_parser() -> Lark:
+    """Create the LALR parser used by the test suite (no line/column metadata)."""
+    return build_lalr_parser(PARSER_CACHE_FILE, propagate_positions=False)
+
+
+def build_positioned_parser() -> Lark:
+    """Create a parser that records line/column metadata on every tree node."""
+    return build_lalr_parser(POSITIONED_PARSER_CACHE_FILE, propagate_positions=True)
+
+
+def build_strict_parser() -> Lark:
+    """Create a parser for reject-only checks: no positions, no placeholders."""
+    return build_lalr_parser(STRICT_PARSER_CACHE_FILE, propagate_positions=False, maybe_placeholders=False)
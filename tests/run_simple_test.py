@@ -4,27 +4,24 @@ Simple standalone test runner - no pytest required.
 Useful for quick validation during grammar development.
 """
 
+import os
 from pathlib import Path
-from lark import Lark
 from lark.exceptions import LarkError
 
+from parser_factory import GRAMMAR_FILE, build_parser
+
 
 def load_parser():
     """Load the grammar file and create parser."""
-    grammar_file = Path(__file__).parent.parent / "grammar" / "message.lark"
-
-    if not grammar_file.exists():
-        print(f"❌ Grammar file not found: {grammar_file}")
+    if not GRAMMAR_FILE.exists():
+        print(f"❌ Grammar file not found: {GRAMMAR_FILE}")
         print("   Available grammar files:")
-        for f in grammar_file.parent.glob("*.lark*"):
+        for f in GRAMMAR_FILE.parent.glob("*.lark*"):
             print(f"   - {f.name}")
         return None
 
-    with open(grammar_file) as f:
-        grammar = f.read()
-
-    print(f"✓ Loaded grammar from {grammar_file.name}")
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
+    print(f"✓ Loaded grammar from {GRAMMAR_FILE.name}")
+    return build_parser()
 
 
 def test_basic_struct(parser):
@@ -154,16 +151,17 @@ def test_test_files(parser):
     passed = 0
     failed = 0
 
-    for file_path in sorted(test_dir.glob("*.msg")):
-        with open(file_path) as f:
-            content = f.read()
+    # One directory scan, then a single whole-file read per .msg file
+    with os.scandir(test_dir) as entries:
+        paths = sorted((entry.name, entry.path) for entry in entries if entry.name.endswith(".msg"))
 
+    for name, path in paths:
         try:
-            tree = parser.parse(content)
-            print(f"✓ {file_path.name}")
+            parser.parse(Path(path).read_text(encoding="utf-8"))
+            print(f"✓ {name}")
             passed += 1
         except LarkError as e:
-            print(f"❌ {file_path.name}: {e}")
+            print(f"❌ {name}: {e}")
             failed += 1
 
     if failed == 0 and passed > 0:
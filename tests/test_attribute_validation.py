@@ -6,15 +6,45 @@ Tests schema-based attribute validation for structs, fields, and enums.
 
 import pytest
 from pathlib import Path
-from lumos_idl.processor import IDLProcessor
+from lumos_idl import IDLProcessor
 from lumos_idl.config import Config, AttributeConfig
 
 
-def test_can_bus_attributes_valid(tmp_path):
+def make_processor(*schemas):
+    """Create a processor with the given attribute schemas enabled."""
+    config = Config()
+    config.attributes.enabled_schemas = list(schemas)
+    return IDLProcessor(config)
+
+
+# Processors are built once per module, since loading the attribute schemas is
+# the expensive part. IDLValidator.validate() clears the symbol table and
+# errors at the start of every run, so tests do not see each other's state.
+# None of these IDL files import others, so no per-test search path is needed.
+@pytest.fixture(scope="module")
+def can_bus_processor():
+    return make_processor("can_bus")
+
+
+@pytest.fixture(scope="module")
+def validation_processor():
+    return make_processor("validation")
+
+
+@pytest.fixture(scope="module")
+def can_bus_and_validation_processor():
+    return make_processor("can_bus", "validation")
+
+
+@pytest.fixture(scope="module")
+def no_schema_processor():
+    return make_processor()
+
+
+def test_can_bus_attributes_valid(can_bus_processor):
     """Test valid CAN bus attributes."""
-    # Create IDL file with CAN bus attributes
-    idl_file = tmp_path / "vehicle.msg"
-    idl_file.write_text("""
+    # IDL source with CAN bus attributes
+    source = """
 namespace vehicle
 
 struct VehicleSpeed
@@ -40,24 +70,18 @@ struct VehicleSpeed
             min: 0.0
             max: 8.0
             scale: 1.0
-""")
+"""
 
     # Configure with CAN bus schema enabled
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["can_bus"]
-
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = can_bus_processor.process_string(source, "vehicle.msg")
 
     # Should succeed with no errors
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_can_bus_attributes_invalid_id(tmp_path):
+def test_can_bus_attributes_invalid_id(can_bus_processor):
     """Test invalid CAN message ID (out of range)."""
-    idl_file = tmp_path / "vehicle.msg"
-    idl_file.write_text("""
+    source = """
 namespace vehicle
 
 struct VehicleSpeed
@@ -67,24 +91,18 @@ struct VehicleSpeed
             cycle_time: 100
 
     float32 speed
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["can_bus"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = can_bus_processor.process_string(source, "vehicle.msg")
 
     # Should fail - ID exceeds 29-bit max
     assert not result.success
-    assert any("greater than maximum" in e.message for e in result.errors)
+    assert result.has_error("greater than maximum")
 
 
-def test_can_bus_attributes_missing_required(tmp_path):
+def test_can_bus_attributes_missing_required(can_bus_processor):
     """Test missing required CAN signal attributes."""
-    idl_file = tmp_path / "vehicle.msg"
-    idl_file.write_text("""
+    source = """
 namespace vehicle
 
 struct VehicleSpeed
@@ -92,24 +110,18 @@ struct VehicleSpeed
         can_signal:
             min: 0.0
             max: 250.0
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["can_bus"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = can_bus_processor.process_string(source, "vehicle.msg")
 
     # Should fail - scale is required
     assert not result.success
-    assert any("Required property 'scale' missing" in e.message for e in result.errors)
+    assert result.has_error("Required property 'scale' missing")
 
 
-def test_validation_attributes_valid(tmp_path):
+def test_validation_attributes_valid(validation_processor):
     """Test valid validation attributes."""
-    idl_file = tmp_path / "sensor.msg"
-    idl_file.write_text("""
+    source = """
 namespace sensor
 
 struct Temperature
@@ -129,22 +141,16 @@ struct Temperature
             min: 1
             max: 64
         pattern: "^[A-Z0-9_]+$"
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "sensor.msg")
 
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_validation_attributes_invalid_align(tmp_path):
+def test_validation_attributes_invalid_align(validation_processor):
     """Test invalid alignment value."""
-    idl_file = tmp_path / "data.msg"
-    idl_file.write_text("""
+    source = """
 namespace data
 
 struct Data
@@ -152,24 +158,18 @@ struct Data
         align: 3
 
     uint32 value
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "data.msg")
 
     # Should fail - align must be power of 2
     assert not result.success
-    assert any("not in allowed values" in e.message for e in result.errors)
+    assert result.has_error("not in allowed values")
 
 
-def test_multiple_schemas(tmp_path):
+def test_multiple_schemas(can_bus_and_validation_processor):
     """Test using multiple schemas together."""
-    idl_file = tmp_path / "vehicle.msg"
-    idl_file.write_text("""
+    source = """
 namespace vehicle
 
 struct VehicleSpeed
@@ -189,22 +189,16 @@ struct VehicleSpeed
             min: 0.0
             max: 250.0
             scale: 0.01
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["can_bus", "validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = can_bus_and_validation_processor.process_string(source, "vehicle.msg")
 
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_unknown_attribute_warning(tmp_path):
+def test_unknown_attribute_warning(validation_processor):
     """Test warning for unknown attributes."""
-    idl_file = tmp_path / "test.msg"
-    idl_file.write_text("""
+    source = """
 namespace test
 
 struct Data
@@ -213,15 +207,11 @@ struct Data
 
     uint32 value
         unknown_field_attr: 42
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
-    config.attributes.warn_unknown_attributes = True
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    # warn_unknown_attributes defaults to True in the shared processor's config
+    assert validation_processor.config.attributes.warn_unknown_attributes
+    result = validation_processor.process_string(source, "test.msg")
 
     # Should have warnings for unknown attributes
     warnings = [e for e in result.errors if e.severity == "warning"]
@@ -230,10 +220,9 @@ struct Data
     assert any("Unknown attribute 'unknown_field_attr'" in w.message for w in warnings)
 
 
-def test_no_schemas_enabled(tmp_path):
+def test_no_schemas_enabled(no_schema_processor):
     """Test that attributes are ignored when no schemas enabled."""
-    idl_file = tmp_path / "test.msg"
-    idl_file.write_text("""
+    source = """
 namespace test
 
 struct Data
@@ -242,23 +231,17 @@ struct Data
 
     uint32 value
         whatever: 42
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = []  # No schemas
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = no_schema_processor.process_string(source, "test.msg")
 
     # Should succeed - no validation when no schemas enabled
     assert result.success
 
 
-def test_enum_attributes(tmp_path):
+def test_enum_attributes(validation_processor):
     """Test enum-level attributes."""
-    idl_file = tmp_path / "status.msg"
-    idl_file.write_text("""
+    source = """
 namespace status
 
 enum Status: uint8
@@ -267,24 +250,18 @@ enum Status: uint8
     IDLE = 0
     RUNNING = 1
     ERROR = 2
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "status.msg")
 
     # Note: This test might need updates once enum attributes are extracted
     # For now, we expect success since enum attributes use struct_attributes field
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_invalid_attribute_type(tmp_path):
+def test_invalid_attribute_type(validation_processor):
     """Test invalid attribute value type."""
-    idl_file = tmp_path / "test.msg"
-    idl_file.write_text("""
+    source = """
 namespace test
 
 struct Data
@@ -292,24 +269,18 @@ struct Data
         packed: "not a boolean"
 
     uint32 value
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "test.msg")
 
     # Should fail - packed must be boolean
     assert not result.success
     assert any("Expected type" in e.message and "boolean" in e.message for e in result.errors)
 
 
-def test_range_validation(tmp_path):
+def test_range_validation(validation_processor):
     """Test range attribute validation."""
-    idl_file = tmp_path / "sensor.msg"
-    idl_file.write_text("""
+    source = """
 namespace sensor
 
 struct Temperature
@@ -322,22 +293,16 @@ struct Temperature
         range:
             min: -32768
             max: 32767
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "sensor.msg")
 
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_length_validation(tmp_path):
+def test_length_validation(validation_processor):
     """Test length attribute validation."""
-    idl_file = tmp_path / "test.msg"
-    idl_file.write_text("""
+    source = """
 namespace test
 
 struct Message
@@ -349,22 +314,16 @@ struct Message
     string code
         length:
             max: 64
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "test.msg")
 
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_pattern_validation(tmp_path):
+def test_pattern_validation(validation_processor):
     """Test pattern attribute validation."""
-    idl_file = tmp_path / "test.msg"
-    idl_file.write_text("""
+    source = """
 namespace test
 
 struct Identifier
@@ -373,22 +332,16 @@ struct Identifier
 
     string code
         pattern: "^[A-Z]{3}[0-9]{4}$"
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["validation"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = validation_processor.process_string(source, "test.msg")
 
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_can_signal_byte_order(tmp_path):
+def test_can_signal_byte_order(can_bus_processor):
     """Test CAN signal byte order validation."""
-    idl_file = tmp_path / "can.msg"
-    idl_file.write_text("""
+    source = """
 namespace can
 
 struct CanData
@@ -405,22 +358,16 @@ struct CanData
             max: 1000.0
             scale: 1.0
             byte_order: "big_endian"
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["can_bus"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = can_bus_processor.process_string(source, "can.msg")
 
     assert result.success, f"Expected success, got errors: {[e.message for e in result.errors]}"
 
 
-def test_can_signal_invalid_byte_order(tmp_path):
+def test_can_signal_invalid_byte_order(can_bus_processor):
     """Test invalid CAN signal byte order."""
-    idl_file = tmp_path / "can.msg"
-    idl_file.write_text("""
+    source = """
 namespace can
 
 struct CanData
@@ -430,18 +377,13 @@ struct CanData
             max: 1000.0
             scale: 1.0
             byte_order: "invalid_order"
-""")
-
-    config = Config()
-    config.search_paths = [tmp_path]
-    config.attributes.enabled_schemas = ["can_bus"]
+"""
 
-    processor = IDLProcessor(config)
-    result = processor.process_file(str(idl_file))
+    result = can_bus_processor.process_string(source, "can.msg")
 
     # Should fail - byte_order must be little_endian or big_endian
     assert not result.success
-    assert any("not in allowed values" in e.message for e in result.errors)
+    assert result.has_error("not in allowed values")
 
 
 if __name__ == "__main__":
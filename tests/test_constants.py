@@ -4,26 +4,41 @@ Test suite for constant definition parsing.
 Tests various constant types, values, and syntax.
 """
 
+import os
 import pytest
 from pathlib import Path
-from lark import Lark
+from lark import Visitor
 from lark.exceptions import LarkError
 
 
-GRAMMAR_FILE = Path(__file__).parent.parent / "grammar" / "message.lark"
 TEST_DIR = Path(__file__).parent / "test_files"
 
+# The `parser` fixture is session-scoped and lives in conftest.py
 
-@pytest.fixture(scope="module")
-def parser():
-    """Load the grammar and create parser instance."""
-    if not GRAMMAR_FILE.exists():
-        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
 
-    with open(GRAMMAR_FILE) as f:
-        grammar = f.read()
+def msg_file_names(directory):
+    """Return the names of the .msg files in a directory from one scan."""
+    if not directory.is_dir():
+        return set()
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries if entry.name.endswith(".msg")}
 
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
+
+class ConstCollector(Visitor):
+    """Collect const_def nodes in source order."""
+
+    def __init__(self):
+        self.consts = []
+
+    def const_def(self, tree):
+        self.consts.append(tree)
+
+
+def extract_consts(tree):
+    """Return every const_def node of a parse tree from a single top-down pass."""
+    collector = ConstCollector()
+    collector.visit_topdown(tree)
+    return collector.consts
 
 
 class TestConstantSyntax:
@@ -34,7 +49,7 @@ class TestConstantSyntax:
         code = "const uint8 MAX_SIZE = 100\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
     def test_multiple_constants(self, parser):
@@ -46,7 +61,7 @@ const uint8 VERSION = 1
         """
         tree = parser.parse(code.strip())
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 3
 
     def test_integer_constant(self, parser):
@@ -54,7 +69,7 @@ const uint8 VERSION = 1
         code = "const uint32 COUNT = 42\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
         # Check for int_const
@@ -66,7 +81,7 @@ const uint8 VERSION = 1
         code = "const float32 PI = 3.14159\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
         # Check for float_const
@@ -78,7 +93,7 @@ const uint8 VERSION = 1
         code = "const int32 OFFSET = -42\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
     def test_negative_float(self, parser):
@@ -86,7 +101,7 @@ const uint8 VERSION = 1
         code = "const float64 TEMP = -273.15\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
     def test_scientific_notation(self, parser):
@@ -94,7 +109,7 @@ const uint8 VERSION = 1
         code = "const float32 SPEED_OF_LIGHT = 3.0e8\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
     def test_constant_with_comment(self, parser):
@@ -102,76 +117,28 @@ const uint8 VERSION = 1
         code = "const uint8 MAX_SIZE = 100  // maximum size\n"
         tree = parser.parse(code)
 
-        const_defs = list(tree.find_data("const_def"))
+        const_defs = extract_consts(tree)
         assert len(const_defs) == 1
 
 
 class TestPrimitiveTypes:
     """Test all primitive type constants."""
 
-    def test_bool_type(self, parser):
-        """Test bool constant."""
-        code = "const bool DEBUG = 1\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_int8_type(self, parser):
-        """Test int8 constant."""
-        code = "const int8 VAL = -128\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_int16_type(self, parser):
-        """Test int16 constant."""
-        code = "const int16 VAL = -1000\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_int32_type(self, parser):
-        """Test int32 constant."""
-        code = "const int32 VAL = -100000\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_int64_type(self, parser):
-        """Test int64 constant."""
-        code = "const int64 VAL = -9223372036854775808\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_uint8_type(self, parser):
-        """Test uint8 constant."""
-        code = "const uint8 VAL = 255\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_uint16_type(self, parser):
-        """Test uint16 constant."""
-        code = "const uint16 VAL = 65535\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_uint32_type(self, parser):
-        """Test uint32 constant."""
-        code = "const uint32 VAL = 4294967295\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_uint64_type(self, parser):
-        """Test uint64 constant."""
-        code = "const uint64 VAL = 18446744073709551615\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_float32_type(self, parser):
-        """Test float32 constant."""
-        code = "const float32 VAL = 3.14159\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_float64_type(self, parser):
-        """Test float64 constant."""
-        code = "const float64 VAL = 2.718281828459045\n"
+    @pytest.mark.parametrize("code", [
+        pytest.param("const bool DEBUG = 1\n", id="bool"),
+        pytest.param("const int8 VAL = -128\n", id="int8"),
+        pytest.param("const int16 VAL = -1000\n", id="int16"),
+        pytest.param("const int32 VAL = -100000\n", id="int32"),
+        pytest.param("const int64 VAL = -9223372036854775808\n", id="int64"),
+        pytest.param("const uint8 VAL = 255\n", id="uint8"),
+        pytest.param("const uint16 VAL = 65535\n", id="uint16"),
+        pytest.param("const uint32 VAL = 4294967295\n", id="uint32"),
+        pytest.param("const uint64 VAL = 18446744073709551615\n", id="uint64"),
+        pytest.param("const float32 VAL = 3.14159\n", id="float32"),
+        pytest.param("const float64 VAL = 2.718281828459045\n", id="float64"),
+    ])
+    def test_primitive_type(self, parser, code):
+        """Test a constant of each primitive type."""
         tree = parser.parse(code)
         assert tree is not None
 
@@ -179,46 +146,43 @@ class TestPrimitiveTypes:
 class TestConstantExtraction:
     """Test extracting constant information from AST."""
 
-    def test_extract_constant_name(self, parser):
-        """Test extracting constant name."""
-        code = "const uint8 MAX_SIZE = 100\n"
-        tree = parser.parse(code)
+    # Trees are parsed once per module and only read by the tests
+    @pytest.fixture(scope="module")
+    def max_size_tree(self, parser):
+        return parser.parse("const uint8 MAX_SIZE = 100\n")
+
+    @pytest.fixture(scope="module")
+    def pi_tree(self, parser):
+        return parser.parse("const float32 PI = 3.14159\n")
 
-        const_def = list(tree.find_data("const_def"))[0]
+    def test_extract_constant_name(self, max_size_tree):
+        """Test extracting constant name."""
+        const_def = extract_consts(max_size_tree)[0]
         # Structure: const_def -> primitive_type, CNAME, const_value
         name = const_def.children[1].value
         assert name == "MAX_SIZE"
 
-    def test_extract_constant_type(self, parser):
+    def test_extract_constant_type(self, max_size_tree):
         """Test extracting constant type."""
-        code = "const uint8 MAX_SIZE = 100\n"
-        tree = parser.parse(code)
-
-        const_def = list(tree.find_data("const_def"))[0]
+        const_def = extract_consts(max_size_tree)[0]
         type_node = const_def.children[0]
 
         # Get the actual type token
         type_value = type_node.children[0].value
         assert type_value == "uint8"
 
-    def test_extract_constant_value(self, parser):
+    def test_extract_constant_value(self, max_size_tree):
         """Test extracting constant value."""
-        code = "const uint8 MAX_SIZE = 100\n"
-        tree = parser.parse(code)
-
-        const_def = list(tree.find_data("const_def"))[0]
+        const_def = extract_consts(max_size_tree)[0]
         value_node = const_def.children[2]
 
         # Get the value
         value = value_node.children[0].value
         assert value == "100"
 
-    def test_extract_float_value(self, parser):
+    def test_extract_float_value(self, pi_tree):
         """Test extracting float constant value."""
-        code = "const float32 PI = 3.14159\n"
-        tree = parser.parse(code)
-
-        const_def = list(tree.find_data("const_def"))[0]
+        const_def = extract_consts(pi_tree)[0]
         value_node = const_def.children[2]
 
         # Get the value
@@ -229,33 +193,33 @@ class TestConstantExtraction:
 class TestInvalidConstants:
     """Test that invalid constant syntax raises errors."""
 
-    def test_missing_type_rejected(self, parser):
+    def test_missing_type_rejected(self, strict_parser):
         """Test that missing type is rejected."""
         code = "const MAX_SIZE = 100\n"
 
         with pytest.raises(LarkError):
-            parser.parse(code)
+            strict_parser.parse(code)
 
-    def test_missing_value_rejected(self, parser):
+    def test_missing_value_rejected(self, strict_parser):
         """Test that missing value is rejected."""
         code = "const uint8 MAX_SIZE =\n"
 
         with pytest.raises(LarkError):
-            parser.parse(code)
+            strict_parser.parse(code)
 
-    def test_missing_equals_rejected(self, parser):
+    def test_missing_equals_rejected(self, strict_parser):
         """Test that missing equals is rejected."""
         code = "const uint8 MAX_SIZE 100\n"
 
         with pytest.raises(LarkError):
-            parser.parse(code)
+            strict_parser.parse(code)
 
-    def test_invalid_type_rejected(self, parser):
+    def test_invalid_type_rejected(self, strict_parser):
         """Test that invalid type is rejected."""
         code = "const string MAX_SIZE = 100\n"
 
         with pytest.raises(LarkError):
-            parser.parse(code)
+            strict_parser.parse(code)
 
 
 class TestMixedContent:
@@ -274,7 +238,7 @@ const float32 THRESHOLD = 0.5
         imports = list(tree.find_data("import_stmt"))
         assert len(imports) == 1
 
-        constants = list(tree.find_data("const_def"))
+        constants = extract_consts(tree)
         assert len(constants) == 2
 
     def test_interleaved_imports_and_constants(self, parser):
@@ -290,7 +254,7 @@ const float32 THRESHOLD = 0.5
         imports = list(tree.find_data("import_stmt"))
         assert len(imports) == 2
 
-        constants = list(tree.find_data("const_def"))
+        constants = extract_consts(tree)
         assert len(constants) == 2
 
 
@@ -308,14 +272,15 @@ class TestConstantTestFiles:
             "constants_and_imports.msg",
         ]
 
+        existing = msg_file_names(TEST_DIR / "valid")
+
         for filename in valid_files:
             file_path = TEST_DIR / "valid" / filename
 
-            if not file_path.exists():
+            if filename not in existing:
                 pytest.skip(f"Test file not found: {filename}")
 
-            with open(file_path) as f:
-                content = f.read()
+            content = file_path.read_text(encoding="utf-8")
 
             try:
                 tree = parser.parse(content)
@@ -323,7 +288,7 @@ class TestConstantTestFiles:
             except LarkError as e:
                 pytest.fail(f"Failed to parse {filename}: {e}")
 
-    def test_invalid_constant_files(self, parser):
+    def test_invalid_constant_files(self, strict_parser):
         """Test that invalid constant files raise errors."""
         invalid_files = [
             "const_missing_type.msg",
@@ -332,55 +297,34 @@ class TestConstantTestFiles:
             "const_invalid_type.msg",
         ]
 
+        existing = msg_file_names(TEST_DIR / "invalid")
+
         for filename in invalid_files:
             file_path = TEST_DIR / "invalid" / filename
 
-            if not file_path.exists():
+            if filename not in existing:
                 continue
 
-            with open(file_path) as f:
-                content = f.read()
+            content = file_path.read_text(encoding="utf-8")
 
             with pytest.raises(LarkError):
-                parser.parse(content)
+                strict_parser.parse(content)
 
 
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
-    def test_very_large_integer(self, parser):
-        """Test very large integer constant."""
-        code = "const uint64 BIG = 18446744073709551615\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_very_small_float(self, parser):
-        """Test very small float constant."""
-        code = "const float64 TINY = 1.23e-308\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_zero_value(self, parser):
-        """Test zero constant."""
-        code = "const uint8 ZERO = 0\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_uppercase_name(self, parser):
-        """Test uppercase constant name (convention)."""
-        code = "const uint8 MAX_SIZE = 100\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_mixed_case_name(self, parser):
-        """Test mixed case constant name (valid but not convention)."""
-        code = "const uint8 MaxSize = 100\n"
-        tree = parser.parse(code)
-        assert tree is not None
-
-    def test_lowercase_name(self, parser):
-        """Test lowercase constant name (valid but not convention)."""
-        code = "const uint8 max_size = 100\n"
+    @pytest.mark.parametrize("code", [
+        pytest.param("const uint64 BIG = 18446744073709551615\n", id="very_large_integer"),
+        pytest.param("const float64 TINY = 1.23e-308\n", id="very_small_float"),
+        pytest.param("const uint8 ZERO = 0\n", id="zero_value"),
+        # Uppercase is the convention; mixed and lowercase names are valid too
+        pytest.param("const uint8 MAX_SIZE = 100\n", id="uppercase_name"),
+        pytest.param("const uint8 MaxSize = 100\n", id="mixed_case_name"),
+        pytest.param("const uint8 max_size = 100\n", id="lowercase_name"),
+    ])
+    def test_edge_case(self, parser, code):
+        """Test boundary values and constant naming styles."""
         tree = parser.parse(code)
         assert tree is not None
 
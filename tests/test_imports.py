@@ -6,170 +6,163 @@ Tests various import path formats, valid and invalid syntax.
 
 import pytest
 from pathlib import Path
-from lark import Lark
-from lark.exceptions import LarkError
+from lark.exceptions import LarkError, UnexpectedToken
+
+from .tree_utils import count_data, first_data
 
 
-GRAMMAR_FILE = Path(__file__).parent.parent / "grammar" / "message.lark"
 TEST_DIR = Path(__file__).parent / "test_files"
 
+# The `parser` and `cached_parse` fixtures are session-scoped and live in conftest.py
 
-@pytest.fixture(scope="module")
-def parser():
-    """Load the grammar and create parser instance."""
-    if not GRAMMAR_FILE.exists():
-        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
 
-    with open(GRAMMAR_FILE) as f:
-        grammar = f.read()
+# Invalid import files, one test case each
+INVALID_IMPORT_FILES = (
+    "import_leading_slash.msg",
+    "import_trailing_slash.msg",
+    "import_double_slash.msg",
+    "import_starts_with_dot.msg",
+    "import_empty_segment.msg",
+)
 
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
+# Paths followed by a stray "/": (code, first path segment). The whole path is
+# rejected, so the error points at its start rather than mid-identifier.
+_CODE_SLASH_AFTER_PATH = (
+    ("import common//geometry\n", "common"),
+    ("import common/geometry/\n", "common"),
+    ("import geometry_v2/\n", "geometry_v2"),
+)
+
+_CODE_MULTIPLE_IMPORTS = """
+import common/geometry
+import common/constants
+import sensors/gps
+""".strip()
+
+_CODE_IMPORT_WITH_LINE_COMMENT = """
+// This is a comment
+import common/geometry  // inline comment
+""".strip()
+
+_CODE_IMPORT_WITH_MULTILINE_COMMENT = """
+/*
+ * Import geometry types
+ */
+import common/geometry
+""".strip()
 
 
 class TestImportSyntax:
     """Test import statement syntax parsing."""
 
-    def test_simple_import(self, parser):
+    def test_simple_import(self, cached_parse):
         """Test basic single import."""
-        code = "import common/geometry\n"
-        tree = parser.parse(code)
+        tree = cached_parse("import common/geometry\n")
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_multiple_imports(self, parser):
+    def test_multiple_imports(self, cached_parse):
         """Test multiple import statements."""
-        code = """
-import common/geometry
-import common/constants
-import sensors/gps
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_MULTIPLE_IMPORTS)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 3
+        assert count_data(tree, "import_stmt") == 3
 
-    def test_nested_path(self, parser):
+    def test_nested_path(self, cached_parse):
         """Test deeply nested import paths."""
         code = "import sensors/gps/v2/types\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_dots_in_segments(self, parser):
+    def test_dots_in_segments(self, cached_parse):
         """Test that dots are allowed in path segments."""
         code = "import common/geo.types\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_multiple_dots_in_segments(self, parser):
+    def test_multiple_dots_in_segments(self, cached_parse):
         """Test multiple dots in path segments."""
         code = "import a.b.c/d.e.f/file.name\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_underscores_in_segments(self, parser):
+    def test_underscores_in_segments(self, cached_parse):
         """Test underscores in path segments."""
         code = "import common/sensor_data\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_numbers_in_segments(self, parser):
+    def test_numbers_in_segments(self, cached_parse):
         """Test numbers in path segments."""
         code = "import sensors/gps2/types\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_import_with_line_comment(self, parser):
+    def test_import_with_line_comment(self, cached_parse):
         """Test import with single-line comment."""
-        code = """
-// This is a comment
-import common/geometry  // inline comment
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_IMPORT_WITH_LINE_COMMENT)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_import_with_multiline_comment(self, parser):
+    def test_import_with_multiline_comment(self, cached_parse):
         """Test import with multiline comment."""
-        code = """
-/*
- * Import geometry types
- */
-import common/geometry
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_IMPORT_WITH_MULTILINE_COMMENT)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
 
 class TestImportPathExtraction:
     """Test extracting import path components from AST."""
 
-    def test_extract_single_segment(self, parser):
+    def test_extract_single_segment(self, cached_parse):
         """Test extracting path with single segment."""
-        code = "import geometry\n"
-        tree = parser.parse(code)
+        tree = cached_parse("import geometry\n")
 
-        import_stmt = list(tree.find_data("import_stmt"))[0]
+        import_stmt = first_data(tree, "import_stmt")
         import_path = import_stmt.children[0]
 
-        # Extract path segments
-        segments = [child.value for child in import_path.children
-                   if hasattr(child, 'value')]
+        # The path is a single IMPORT_PATH token; segments are split from its value
+        segments = import_path.value.split("/")
 
         assert segments == ["geometry"]
 
-    def test_extract_multiple_segments(self, parser):
+    def test_extract_multiple_segments(self, cached_parse):
         """Test extracting path with multiple segments."""
-        code = "import common/geometry\n"
-        tree = parser.parse(code)
+        tree = cached_parse("import common/geometry\n")
 
-        import_stmt = list(tree.find_data("import_stmt"))[0]
+        import_stmt = first_data(tree, "import_stmt")
         import_path = import_stmt.children[0]
 
-        # Extract path segments
-        segments = [child.value for child in import_path.children
-                   if hasattr(child, 'value')]
+        # The path is a single IMPORT_PATH token; segments are split from its value
+        segments = import_path.value.split("/")
 
         assert segments == ["common", "geometry"]
 
-    def test_extract_nested_path(self, parser):
+    def test_extract_nested_path(self, cached_parse):
         """Test extracting deeply nested path."""
-        code = "import a/b/c/d\n"
-        tree = parser.parse(code)
+        tree = cached_parse("import a/b/c/d\n")
 
-        import_stmt = list(tree.find_data("import_stmt"))[0]
+        import_stmt = first_data(tree, "import_stmt")
         import_path = import_stmt.children[0]
 
-        # Extract path segments
-        segments = [child.value for child in import_path.children
-                   if hasattr(child, 'value')]
+        # The path is a single IMPORT_PATH token; segments are split from its value
+        segments = import_path.value.split("/")
 
         assert segments == ["a", "b", "c", "d"]
 
-    def test_path_to_file_resolution(self, parser):
+    def test_path_to_file_resolution(self, cached_parse):
         """Test converting import path to file path."""
-        code = "import common/geometry\n"
-        tree = parser.parse(code)
+        tree = cached_parse("import common/geometry\n")
 
-        import_stmt = list(tree.find_data("import_stmt"))[0]
+        import_stmt = first_data(tree, "import_stmt")
         import_path = import_stmt.children[0]
 
-        # Extract path segments
-        segments = [child.value for child in import_path.children
-                   if hasattr(child, 'value')]
+        # The path is a single IMPORT_PATH token; segments are split from its value
+        segments = import_path.value.split("/")
 
         # Convert to file path
         file_path = "/".join(segments) + ".msg"
@@ -200,6 +193,16 @@ class TestInvalidImports:
         with pytest.raises(LarkError):
             parser.parse(code)
 
+    @pytest.mark.parametrize("code,segment", _CODE_SLASH_AFTER_PATH)
+    def test_slash_error_reported_at_path_start(self, parser, code, segment):
+        """Test that a stray slash is reported at the path, not inside a segment."""
+        with pytest.raises(UnexpectedToken) as exc_info:
+            parser.parse(code)
+
+        error = exc_info.value
+        assert (error.line, error.column) == (1, len("import ") + 1)
+        assert error.token == segment
+
     def test_segment_starting_with_dot_rejected(self, parser):
         """Test that segment starting with dot is rejected."""
         code = "import .common/geometry\n"
@@ -225,7 +228,7 @@ class TestInvalidImports:
 class TestImportTestFiles:
     """Test parsing of import test files."""
 
-    def test_valid_import_files(self, parser):
+    def test_valid_import_files(self, parser, msg_contents):
         """Test all valid import test files parse successfully."""
         valid_import_files = [
             "imports_simple.msg",
@@ -238,11 +241,10 @@ class TestImportTestFiles:
         for filename in valid_import_files:
             file_path = TEST_DIR / "valid" / filename
 
-            if not file_path.exists():
+            if file_path not in msg_contents:
                 pytest.skip(f"Test file not found: {filename}")
 
-            with open(file_path) as f:
-                content = f.read()
+            content = msg_contents[file_path]
 
             try:
                 tree = parser.parse(content)
@@ -250,84 +252,72 @@ class TestImportTestFiles:
             except LarkError as e:
                 pytest.fail(f"Failed to parse {filename}: {e}")
 
-    def test_invalid_import_files(self, parser):
+    @pytest.mark.parametrize("filename", INVALID_IMPORT_FILES)
+    def test_invalid_import_files(self, strict_parser, msg_contents, filename):
         """Test that invalid import files raise errors."""
-        invalid_import_files = [
-            "import_leading_slash.msg",
-            "import_trailing_slash.msg",
-            "import_double_slash.msg",
-            "import_starts_with_dot.msg",
-            "import_empty_segment.msg",
-        ]
+        file_path = TEST_DIR / "invalid" / filename
 
-        for filename in invalid_import_files:
-            file_path = TEST_DIR / "invalid" / filename
+        if file_path not in msg_contents:
+            pytest.skip(f"Test file not found: {filename}")
 
-            if not file_path.exists():
-                continue  # Skip if file doesn't exist
+        # Plain try/except: only the fact that parsing fails matters here
+        try:
+            strict_parser.parse(msg_contents[file_path])
+        except LarkError:
+            return
+        pytest.fail(f"Expected a parse error for {filename}")
 
-            with open(file_path) as f:
-                content = f.read()
 
-            with pytest.raises(LarkError,
-                             match=None):  # Just verify it raises an error
-                parser.parse(content)
+_CODE_ONLY_COMMENTS = """
+// Just comments
+/* And multiline
+   comments */
+""".strip()
 
 
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
-    def test_single_segment_path(self, parser):
+    def test_single_segment_path(self, cached_parse):
         """Test import with just one segment (no slash)."""
         code = "import geometry\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_very_long_path(self, parser):
+    def test_very_long_path(self, cached_parse):
         """Test import with many nested segments."""
         code = "import a/b/c/d/e/f/g/h/i/j\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_segment_all_numbers(self, parser):
+    def test_segment_all_numbers(self, cached_parse):
         """Test segment with all numbers (but not starting with number)."""
         code = "import v2023/types\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_mixed_dots_underscores(self, parser):
+    def test_mixed_dots_underscores(self, cached_parse):
         """Test segment with both dots and underscores."""
         code = "import common/sensor_data.v2\n"
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 1
+        assert count_data(tree, "import_stmt") == 1
 
-    def test_empty_file(self, parser):
+    def test_empty_file(self, cached_parse):
         """Test parsing empty file (no imports)."""
         code = ""
-        tree = parser.parse(code)
+        tree = cached_parse(code)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 0
+        assert count_data(tree, "import_stmt") == 0
 
-    def test_only_comments(self, parser):
+    def test_only_comments(self, cached_parse):
         """Test file with only comments, no imports."""
-        code = """
-// Just comments
-/* And multiline
-   comments */
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_ONLY_COMMENTS)
 
-        imports = list(tree.find_data("import_stmt"))
-        assert len(imports) == 0
+        assert count_data(tree, "import_stmt") == 0
 
 
 if __name__ == "__main__":
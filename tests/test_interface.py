@@ -0,0 +1,174 @@
+"""
+Test suite for interface definitions.
+"""
+
+from lumos_idl.parser.preprocessor import IndentationPreprocessor
+
+from .tree_utils import index_data
+
+
+# The `parser` fixture is session-scoped and lives in conftest.py
+
+# The preprocessor keeps no state between process() calls, so one instance is shared
+_PREPROCESSOR = IndentationPreprocessor()
+
+
+def preprocess(code):
+    """Preprocess indentation."""
+    return _PREPROCESSOR.process(code)
+
+
+def test_simple_interface(parser):
+    """Test simple interface definition."""
+    code = """interface Position
+    float64 lat
+    float64 lon
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    interfaces = index_data(tree)["interface_def"]
+    assert len(interfaces) == 1, f"expected 1 interface, got {len(interfaces)}"
+    # Interface name is children[1] (children[0] is INTERFACE token)
+    assert interfaces[0].children[1].value == "Position"
+
+
+def test_interface_with_attributes(parser):
+    """Test interface with [attributes] block."""
+    code = """interface Config
+    [attributes]
+        version: \"1.0\"
+        packed: true
+    uint32 id
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+    assert len(data["struct_attributes"]) == 1
+
+
+def test_interface_with_field_numbers(parser):
+    """Test interface with field numbering."""
+    code = """interface Data
+    uint32 id : 0
+    string name : 1
+    float64 value : 2
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+    assert len(data["field_number"]) == 3
+
+
+def test_interface_with_optional(parser):
+    """Test interface with optional fields."""
+    code = """interface Sensor
+    uint32 id
+    optional float64 temperature
+    optional string location
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+
+
+def test_interface_with_collections(parser):
+    """Test interface with collection types."""
+    code = """interface SensorData
+    array<uint8, 100> data
+    matrix<float32, 3, 3> transform
+    tensor<float32, 10, 10, 10> grid
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+    assert len(data["collection_type_field"]) == 3
+
+
+def test_interface_with_inline_attributes(parser):
+    """Test interface with inline attributes."""
+    code = """interface Data
+    uint32 id @primary(true), @required(true)
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+    assert len(data["inline_attribute"]) == 2
+
+
+def test_interface_with_indented_attributes(parser):
+    """Test interface with indented field attributes."""
+    code = """interface Position
+    float64 lat
+        description: \"Latitude\"
+        unit: \"degrees\"
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+    assert len(data["field_attributes"]) == 1
+
+
+def test_struct_and_interface_together(parser):
+    """Test mixing struct and interface in same file."""
+    code = """struct Data
+    uint32 id
+
+interface Config
+    string name
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+    structs = data["struct_def"]
+    interfaces = data["interface_def"]
+
+    assert len(structs) == 1, f"got {len(structs)} structs"
+    assert len(interfaces) == 1, f"got {len(interfaces)} interfaces"
+
+
+def test_comprehensive_interface(parser):
+    """Test interface with all features combined."""
+    code = """interface SensorData
+    [attributes]
+        version: \"1.0\"
+        packed: true
+
+    uint32 id : 0 @primary(true)
+    optional float64 temperature : 1
+        unit: \"celsius\"
+        range: \"-40 to 85\"
+    array<uint8, 100> raw_data : 2
+    Vector3 position : 3
+    common::geometry::Quaternion rotation : 4
+"""
+
+    tree = parser.parse(preprocess(code))
+
+    data = index_data(tree)
+
+    assert len(data["interface_def"]) == 1
+    assert len(data["struct_attributes"]) == 1
+    assert len(data["field_number"]) == 5
+    assert len(data["inline_attribute"]) == 1
+    assert len(data["field_attributes"]) == 1
+
@@ -6,37 +6,24 @@ Tests parsing, validation, and AST generation for various IDL constructs.
 
 import pytest
 from pathlib import Path
-from lark import Lark
 from lark.exceptions import LarkError, UnexpectedInput, UnexpectedToken
 
+from lumos_idl.parser.preprocessor import IndentationPreprocessor
 
-# Test configuration
-TEST_DIR = Path(__file__).parent / "test_files"
-GRAMMAR_FILE = Path(__file__).parent.parent / "grammar" / "message.lark"
-
+from .tree_utils import first_data, index_data
 
-@pytest.fixture(scope="module")
-def parser():
-    """Load the grammar and create parser instance."""
-    if not GRAMMAR_FILE.exists():
-        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
-
-    with open(GRAMMAR_FILE) as f:
-        grammar = f.read()
-
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
 
+# Test configuration
+TEST_DIR = Path(__file__).parent / "test_files"
 
-@pytest.fixture(scope="module")
-def valid_files():
-    """Get all valid test files."""
-    return list((TEST_DIR / "valid").glob("*.msg"))
+# Collected at import so every file becomes its own test case
+VALID_FILES = sorted((TEST_DIR / "valid").glob("*.msg"))
+INVALID_FILES = sorted((TEST_DIR / "invalid").glob("*.msg"))
 
+# Invalid files that test semantic errors (not syntax errors)
+SEMANTIC_ERROR_FILES = {"unknown_type.msg", "missing_import.msg"}
 
-@pytest.fixture(scope="module")
-def invalid_files():
-    """Get all invalid test files."""
-    return list((TEST_DIR / "invalid").glob("*.msg"))
+# The `parser` fixture is session-scoped and lives in conftest.py
 
 
 class TestParsing:
@@ -46,30 +33,57 @@ class TestParsing:
         """Verify parser is created successfully."""
         assert parser is not None
 
-    def test_parse_valid_files(self, parser, valid_files):
-        """All valid test files should parse without errors."""
-        for file_path in valid_files:
-            with open(file_path) as f:
-                content = f.read()
+    @pytest.mark.parametrize("file_path", VALID_FILES, ids=lambda p: p.name)
+    def test_parse_valid_file(self, parser, msg_contents, file_path):
+        """Each valid test file should parse without errors."""
+        content = msg_contents[file_path]
+
+        try:
+            tree = parser.parse(content)
+            assert tree is not None, f"Parse tree is None for {file_path.name}"
+        except LarkError as e:
+            pytest.fail(f"Failed to parse {file_path.name}: {e}")
+
+    @pytest.mark.parametrize("file_path", INVALID_FILES, ids=lambda p: p.name)
+    def test_invalid_file_raises_error(self, parser, msg_contents, file_path):
+        """Each invalid test file should raise a parsing error."""
+        if file_path.name in SEMANTIC_ERROR_FILES:
+            pytest.skip("Tests a semantic error, not a syntax error")
+
+        content = msg_contents[file_path]
 
-            try:
-                tree = parser.parse(content)
-                assert tree is not None, f"Parse tree is None for {file_path.name}"
-            except LarkError as e:
-                pytest.fail(f"Failed to parse {file_path.name}: {e}")
+        with pytest.raises(LarkError):
+            parser.parse(content)
 
-    def test_invalid_files_raise_errors(self, parser, invalid_files):
-        """Invalid test files should raise parsing errors."""
-        for file_path in invalid_files:
-            # Skip files that test semantic errors (not syntax errors)
-            if file_path.name in ["unknown_type.msg", "missing_import.msg"]:
-                continue
 
-            with open(file_path) as f:
-                content = f.read()
+_CODE_PARSE_CONSTANTS = """
+const uint8 MAX_COUNT = 100
+const float32 PI = 3.14159
+""".strip()
+
+_CODE_PARSE_ENUM = """
+enum Status
+    IDLE = 0
+    RUNNING = 1
+    ERROR = 2
+""".strip()
+
+_CODE_PARSE_STRUCT = """
+struct Point
+    float32 x
+    float32 y
+    float32 z
+""".strip()
+
+_CODE_PARSE_INTERFACE = """
+struct Position
+    float64 x
+    float64 y
 
-            with pytest.raises(LarkError):
-                parser.parse(content)
+interface RobotStatus
+    Position pos
+    uint8 battery_level
+""".strip()
 
 
 class TestBasicTypes:
@@ -77,11 +91,7 @@ class TestBasicTypes:
 
     def test_parse_constants(self, parser):
         """Test constant definitions."""
-        code = """
-const uint8 MAX_COUNT = 100
-const float32 PI = 3.14159
-        """
-        tree = parser.parse(code.strip())
+        tree = parser.parse(_CODE_PARSE_CONSTANTS)
 
         # Find all constant definitions
         const_defs = list(tree.find_data("const_def"))
@@ -89,126 +99,122 @@ const float32 PI = 3.14159
 
     def test_parse_enum(self, parser):
         """Test enum definitions."""
-        code = """
-enum Status
-    IDLE = 0
-    RUNNING = 1
-    ERROR = 2
-        """
-        tree = parser.parse(code.strip())
+        tree = parser.parse(_CODE_PARSE_ENUM)
+        nodes = index_data(tree)
 
-        enum_defs = list(tree.find_data("enum_def"))
+        enum_defs = nodes["enum_def"]
         assert len(enum_defs) == 1
 
-        enum_entries = list(tree.find_data("enum_entry"))
+        enum_entries = nodes["enum_entry"]
         assert len(enum_entries) == 3
 
     def test_parse_struct(self, parser):
         """Test struct definitions."""
-        code = """
-struct Point
-    float32 x
-    float32 y
-    float32 z
-        """
-        tree = parser.parse(code.strip())
+        tree = parser.parse(_CODE_PARSE_STRUCT)
+        nodes = index_data(tree)
 
-        struct_defs = list(tree.find_data("struct_def"))
+        struct_defs = nodes["struct_def"]
         assert len(struct_defs) == 1
 
         # Check for fields (exact name depends on grammar)
         # This is flexible to work with different field naming
-        fields = list(tree.find_data("struct_field")) or list(tree.find_data("field"))
+        fields = nodes["struct_field"] or nodes["field"]
         assert len(fields) >= 3
 
     def test_parse_interface(self, parser):
         """Test interface definitions."""
-        code = """
-struct Position
-    float64 x
-    float64 y
-
-interface RobotStatus
-    Position pos
-    uint8 battery_level
-        """
-        tree = parser.parse(code.strip())
+        tree = parser.parse(_CODE_PARSE_INTERFACE)
 
         interface_defs = list(tree.find_data("interface_def"))
         assert len(interface_defs) == 1
 
 
-class TestAdvancedFeatures:
-    """Test advanced language features."""
-
-    def test_parse_comments(self, parser):
-        """Test that comments are properly ignored."""
-        code = """
+_CODE_PARSE_COMMENTS = """
 // This is a comment
 struct Test
     uint32 value  // inline comment
-        """
-        tree = parser.parse(code.strip())
-        assert tree is not None
+""".strip()
 
-    def test_parse_multiline_comment(self, parser):
-        """Test multiline comments."""
-        code = """
+_CODE_PARSE_MULTILINE_COMMENT = """
 /*
 This is a
 multiline comment
 */
 struct Test
     uint32 value
-        """
+""".strip()
+
+_CODE_PARSE_TYPE_ALIAS = """
+using Timestamp = uint64
+
+struct Event
+    Timestamp time
+""".strip()
+
+_CODE_PARSE_IMPORT = """
+import common/geometry
+
+struct Test
+    uint32 value
+""".strip()
+
+
+class TestAdvancedFeatures:
+    """Test advanced language features."""
+
+    def test_parse_comments(self, parser):
+        """Test that comments are properly ignored."""
+        tree = parser.parse(_CODE_PARSE_COMMENTS)
+        assert tree is not None
+
+    def test_parse_multiline_comment(self, parser):
+        """Test multiline comments."""
         # This may or may not work depending on grammar
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_PARSE_MULTILINE_COMMENT)
             assert tree is not None
         except LarkError:
             pytest.skip("Multiline comments not supported in current grammar")
 
     def test_parse_type_alias(self, parser):
         """Test type aliases."""
-        code = """
-using Timestamp = uint64
-
-struct Event
-    Timestamp time
-        """
         try:
-            tree = parser.parse(code.strip())
-            using_defs = list(tree.find_data("using_def")) or list(tree.find_data("type_alias"))
+            tree = parser.parse(_CODE_PARSE_TYPE_ALIAS)
+            nodes = index_data(tree)
+            using_defs = nodes["using_def"] or nodes["type_alias"]
             assert len(using_defs) >= 1
         except LarkError:
             pytest.skip("Type aliases not supported in current grammar")
 
     def test_parse_import(self, parser):
         """Test import statements."""
-        code = """
-import common/geometry
-
-struct Test
-    uint32 value
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_PARSE_IMPORT)
             imports = list(tree.find_data("import_stmt"))
             assert len(imports) == 1
         except LarkError:
             pytest.skip("Imports not supported in current grammar")
 
 
+_CODE_STRUCT_NAME_EXTRACTION = """
+struct MyStruct
+    uint32 field1
+""".strip()
+
+_CODE_ENUM_VALUES = """
+enum Color
+    RED = 0
+    GREEN = 1
+    BLUE = 2
+""".strip()
+
+
 class TestStructureValidation:
     """Test AST structure and validation."""
 
     def test_struct_name_extraction(self, parser):
         """Test that we can extract struct names from AST."""
-        code = """
-struct MyStruct
-    uint32 field1
-        """
-        tree = parser.parse(code.strip())
+        tree = parser.parse(_CODE_STRUCT_NAME_EXTRACTION)
 
         struct_defs = list(tree.find_data("struct_def"))
         assert len(struct_defs) == 1
@@ -220,13 +226,7 @@ struct MyStruct
 
     def test_enum_values(self, parser):
         """Test enum value extraction."""
-        code = """
-enum Color
-    RED = 0
-    GREEN = 1
-    BLUE = 2
-        """
-        tree = parser.parse(code.strip())
+        tree = parser.parse(_CODE_ENUM_VALUES)
 
         enum_entries = list(tree.find_data("enum_entry"))
         assert len(enum_entries) == 3
@@ -243,13 +243,31 @@ enum Color
             "uint8", "uint16", "uint32", "uint64"
         ]
 
-        for ptype in primitive_types:
-            code = f"""
+        # One struct per type in a single source, so the parser runs once
+        code = "\n\n".join(
+            f"struct Test_{ptype}\n    {ptype} field" for ptype in primitive_types
+        )
+        tree = parser.parse(code)
+
+        struct_defs = list(tree.find_data("struct_def"))
+        assert len(struct_defs) == len(primitive_types)
+
+
+_CODE_FIXED_SIZE_ARRAY = """
+struct Test
+    array<uint8, 12> data
+""".strip()
+
+_CODE_DYNAMIC_ARRAY = """
 struct Test
-    {ptype} field
-            """
-            tree = parser.parse(code.strip())
-            assert tree is not None, f"Failed to parse primitive type: {ptype}"
+    array<uint8> data
+""".strip()
+
+_CODE_MATRIX_TENSOR = """
+struct Test
+    matrix<float32, 3, 3> rotation
+    tensor<float32, 10, 10, 3> voxels
+""".strip()
 
 
 class TestArrays:
@@ -257,102 +275,95 @@ class TestArrays:
 
     def test_fixed_size_array(self, parser):
         """Test fixed-size array syntax."""
-        code = """
-struct Test
-    array<uint8, 12> data
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_FIXED_SIZE_ARRAY)
             assert tree is not None
         except LarkError:
             pytest.skip("Arrays not supported in current grammar")
 
     def test_dynamic_array(self, parser):
         """Test dynamic array syntax."""
-        code = """
-struct Test
-    array<uint8> data
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_DYNAMIC_ARRAY)
             assert tree is not None
         except LarkError:
             pytest.skip("Dynamic arrays not supported in current grammar")
 
     def test_matrix_tensor(self, parser):
         """Test matrix and tensor syntax."""
-        code = """
-struct Test
-    matrix<float32, 3, 3> rotation
-    tensor<float32, 10, 10, 3> voxels
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_MATRIX_TENSOR)
             assert tree is not None
         except LarkError:
             pytest.skip("Matrices/tensors not supported in current grammar")
 
 
+_CODE_STRUCT_ATTRIBUTES = """
+@deprecated
+@version("1.0")
+struct Test
+    uint32 value
+""".strip()
+
+_CODE_FIELD_ATTRIBUTES_INLINE = """
+struct Test
+    float64 value @description("A test value") @unit("meters")
+""".strip()
+
+_CODE_FIELD_ATTRIBUTES_BLOCK = """
+struct Test
+    float64 value
+    {
+        description: "A test value"
+        unit: "meters"
+    }
+""".strip()
+
+
 class TestAttributes:
     """Test attribute parsing."""
 
     def test_struct_attributes(self, parser):
         """Test attributes on structs."""
-        code = """
-@deprecated
-@version("1.0")
-struct Test
-    uint32 value
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_STRUCT_ATTRIBUTES)
             assert tree is not None
         except LarkError:
             pytest.skip("Struct attributes not supported in current grammar")
 
     def test_field_attributes_inline(self, parser):
         """Test inline field attributes."""
-        code = """
-struct Test
-    float64 value @description("A test value") @unit("meters")
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_FIELD_ATTRIBUTES_INLINE)
             assert tree is not None
         except LarkError:
             pytest.skip("Field attributes not supported in current grammar")
 
     def test_field_attributes_block(self, parser):
         """Test block-style field attributes."""
-        code = """
-struct Test
-    float64 value
-    {
-        description: "A test value"
-        unit: "meters"
-    }
-        """
         try:
-            tree = parser.parse(code.strip())
+            tree = parser.parse(_CODE_FIELD_ATTRIBUTES_BLOCK)
             assert tree is not None
         except LarkError:
             pytest.skip("Block field attributes not supported in current grammar")
 
 
+_CODE_LINE_NUMBERS = """
+struct Test
+    uint32 field1
+    float32 field2
+""".strip()
+
+
 class TestPositionTracking:
     """Test that parser tracks source positions."""
 
-    def test_line_numbers(self, parser):
+    def test_line_numbers(self, positioned_parser):
         """Test that AST nodes have line number information."""
-        code = """
-struct Test
-    uint32 field1
-    float32 field2
-        """
-        tree = parser.parse(code.strip())
+        tree = positioned_parser.parse(_CODE_LINE_NUMBERS)
 
         # Check if position information is available
-        struct_def = list(tree.find_data("struct_def"))[0]
+        struct_def = first_data(tree, "struct_def")
 
         # Meta should contain line and column info
         if hasattr(struct_def, 'meta'):
@@ -360,37 +371,49 @@ struct Test
             assert struct_def.meta.line > 0
 
 
+_CODE_UNEXPECTED_TOKEN_ERROR = """
+struct Test
+    uint32
+""".strip()
+
+_CODE_INCOMPLETE_DEFINITION_ERROR = """
+struct
+""".strip()
+
+# A stray identifier should be reported as CNAME, not as an import path
+_CODE_STRAY_IDENTIFIERS = (
+    "struct Foo\n    uint32 x y\n",
+    "enum B C\n",
+)
+
+
 class TestErrorMessages:
     """Test that helpful error messages are generated."""
 
     def test_unexpected_token_error(self, parser):
         """Test error message for unexpected token."""
-        code = """
-struct Test
-    uint32
-        """
         with pytest.raises((UnexpectedInput, UnexpectedToken, LarkError)) as exc_info:
-            parser.parse(code.strip())
+            parser.parse(_CODE_UNEXPECTED_TOKEN_ERROR)
 
         # Just verify we get some error
         assert exc_info.value is not None
 
     def test_incomplete_definition_error(self, parser):
         """Test error for incomplete definitions."""
-        code = """
-struct
-        """
         with pytest.raises(LarkError):
-            parser.parse(code.strip())
+            parser.parse(_CODE_INCOMPLETE_DEFINITION_ERROR)
 
+    @pytest.mark.parametrize("code", _CODE_STRAY_IDENTIFIERS)
+    def test_stray_identifier_reported_as_cname(self, parser, code):
+        """Test that the error for a stray identifier names a CNAME token."""
+        with pytest.raises(UnexpectedToken) as exc_info:
+            parser.parse(IndentationPreprocessor().process(code))
 
-# Integration test
-class TestRealWorldExample:
-    """Test parsing of realistic, complex examples."""
+        assert exc_info.value.token.type == "CNAME"
 
-    def test_complex_struct(self, parser):
-        """Test parsing a complex struct with multiple field types."""
-        code = """
+
+# Integration test
+_CODE_COMPLEX_STRUCT = """
 enum Status
     OK = 0
     ERROR = 1
@@ -400,12 +423,20 @@ struct ComplexMessage
     Status status
     float32 temperature
     bool is_valid
-        """
-        tree = parser.parse(code.strip())
+""".strip()
+
+
+class TestRealWorldExample:
+    """Test parsing of realistic, complex examples."""
+
+    def test_complex_struct(self, parser):
+        """Test parsing a complex struct with multiple field types."""
+        tree = parser.parse(_CODE_COMPLEX_STRUCT)
 
         # Should have 1 enum and 1 struct
-        assert len(list(tree.find_data("enum_def"))) == 1
-        assert len(list(tree.find_data("struct_def"))) == 1
+        nodes = index_data(tree)
+        assert len(nodes["enum_def"]) == 1
+        assert len(nodes["struct_def"]) == 1
 
 
 if __name__ == "__main__":
@@ -5,13 +5,37 @@ Tests type checking, import resolution, and other semantic rules.
 """
 
 import pytest
-from pathlib import Path
 from collections import defaultdict
-from lark import Lark
+from pathlib import Path
+from lark import Token, Tree
+
+from lumos_idl.parser.preprocessor import IndentationPreprocessor
+
+from .tree_utils import index_data
 
 
 TEST_DIR = Path(__file__).parent / "test_files"
-GRAMMAR_FILE = Path(__file__).parent.parent / "grammar" / "message.lark"
+
+# Collected at import so every file becomes its own test case
+VALID_FILES = sorted((TEST_DIR / "valid").glob("*.msg"))
+
+# Root and file path shared by the single-file type validation tests
+_ROOT = Path(".")
+_TEST_FILE = Path("test.msg")
+
+PRIMITIVE_TYPES = frozenset({
+    "bool", "string",
+    "float32", "float64",
+    "int8", "int16", "int32", "int64",
+    "uint8", "uint16", "uint32", "uint64"
+})
+
+# Rules for user-defined type definitions; children[1] is the type name
+# (children[0] is the struct/enum keyword)
+TYPE_DEFINITION_RULES = ("struct_def", "enum_def")
+
+# Field rules whose type is a user-defined reference rather than a primitive
+TYPE_REFERENCE_RULES = ("user_type_field", "qualified_type_field")
 
 
 class TypeValidator:
@@ -22,12 +46,12 @@ class TypeValidator:
         self.parsed_files = {}
         self.defined_types_by_file = defaultdict(set)
         self.imported_files_by_file = defaultdict(set)
-        self.primitive_types = {
-            "bool", "string",
-            "float32", "float64",
-            "int8", "int16", "int32", "int64",
-            "uint8", "uint16", "uint32", "uint64"
-        }
+
+    def reset(self):
+        """Forget all parsed files and collected types."""
+        self.parsed_files.clear()
+        self.defined_types_by_file.clear()
+        self.imported_files_by_file.clear()
 
     def file_namespace(self, path: Path, root: Path) -> str:
         """Convert file path to namespace."""
@@ -39,10 +63,7 @@ class TypeValidator:
         if file_path in self.parsed_files:
             return self.parsed_files[file_path]
 
-        with open(file_path) as f:
-            content = f.read()
-
-        tree = self.parser.parse(content)
+        tree = self.parser.parse(file_path.read_text(encoding="utf-8"))
         self.parsed_files[file_path] = tree
 
         # Extract imports if supported
@@ -60,18 +81,17 @@ class TypeValidator:
         """Collect all defined types from parsed files."""
         for file_path, tree in self.parsed_files.items():
             namespace = self.file_namespace(file_path, root)
+            nodes = index_data(tree)
 
-            # Collect structs
-            for node in tree.find_data("struct_def"):
-                typename = node.children[0].value
-                fq_name = f"{namespace}::{typename}"
-                self.defined_types_by_file[file_path].add(fq_name)
+            for rule in TYPE_DEFINITION_RULES:
+                for node in nodes[rule]:
+                    typename = node.children[1].value
+                    self.defined_types_by_file[file_path].add(f"{namespace}::{typename}")
 
-            # Collect enums
-            for node in tree.find_data("enum_def"):
-                typename = node.children[0].value
-                fq_name = f"{namespace}::{typename}"
-                self.defined_types_by_file[file_path].add(fq_name)
+    def run(self, root: Path) -> list:
+        """Collect defined types, then validate all type references."""
+        self.collect_defined_types(root)
+        return self.validate_types(root)
 
     def validate_types(self, root: Path) -> list:
         """Validate all type references."""
@@ -85,23 +105,40 @@ class TypeValidator:
             for imported in self.imported_files_by_file[file_path]:
                 visible_types |= self.defined_types_by_file[imported]
 
-            # Check struct fields
-            for field_node in tree.find_data("struct_or_enum_ref"):
-                try:
-                    type_node = field_node.children[0]
-                    field_name = field_node.children[1].value
+            # Check struct fields with user-defined types
+            nodes = index_data(tree)
+            for rule in TYPE_REFERENCE_RULES:
+                for field_node in nodes[rule]:
+                    # Skip the leading OPTIONAL token, if present
+                    children = field_node.children
+                    if isinstance(children[0], Token) and children[0].type == "OPTIONAL":
+                        children = children[1:]
+                    if len(children) < 2 or not isinstance(children[1], Token):
+                        # Structure differs from what this check expects; report it
+                        errors.append({
+                            'file': file_path,
+                            'field': None,
+                            'type': None,
+                            'message': f"Unexpected '{field_node.data}' node structure"
+                        })
+                        continue
+
+                    type_node = children[0]
+                    field_name = children[1].value
 
                     # Extract type name (simple or namespaced)
-                    if hasattr(type_node, 'value'):
+                    if isinstance(type_node, Token):
                         typename = type_node.value
                         full_name = f"{current_ns}::{typename}"
                     else:
-                        # Namespaced type
-                        typename = str(type_node)
+                        # Namespaced type: qualified_type segments without the separators
+                        typename = "::".join(
+                            child.value for child in type_node.children if child.type != "NAMESPACE_SEP"
+                        )
                         full_name = typename
 
                     # Skip primitive types
-                    if typename.split("::")[-1] in self.primitive_types:
+                    if typename.rpartition("::")[2] in PRIMITIVE_TYPES:
                         continue
 
                     # Check if type is visible
@@ -112,55 +149,39 @@ class TypeValidator:
                             'type': typename,
                             'message': f"Unknown type '{typename}' in field '{field_name}'"
                         })
-                except Exception as e:
-                    # Structure might be different, skip
-                    pass
 
         return errors
 
 
-@pytest.fixture(scope="module")
-def parser():
-    """Load the grammar and create parser instance."""
-    if not GRAMMAR_FILE.exists():
-        pytest.skip(f"Grammar file not found: {GRAMMAR_FILE}")
-
-    with open(GRAMMAR_FILE) as f:
-        grammar = f.read()
+# The `parser` fixture is session-scoped and lives in conftest.py; its LALR
+# tables are loaded from the .lark_cache/ pickle rather than rebuilt
 
-    return Lark(grammar, parser="lalr", start="start", propagate_positions=True)
 
-
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def validator(parser):
     """Create type validator instance."""
     return TypeValidator(parser)
 
 
-class TestTypeValidation:
-    """Test type checking and validation."""
+@pytest.fixture(autouse=True)
+def _reset_validator(validator):
+    """Give every test an empty validator without rebuilding it."""
+    yield
+    validator.reset()
 
-    def test_valid_primitive_types(self, validator):
-        """Test that all primitive types are recognized as valid."""
-        code = """
+
+# The type validation snippets rely on indentation, so they are preprocessed
+# into INDENT/DEDENT tokens before parsing
+_PREPROCESSOR = IndentationPreprocessor()
+
+_CODE_VALID_PRIMITIVE_TYPES = """
 struct Test
     bool flag
     uint32 count
     float64 value
-        """
-        root = Path(".")
-        file_path = Path("test.msg")
-
-        validator.parsed_files[file_path] = validator.parser.parse(code.strip())
-        validator.collect_defined_types(root)
-        errors = validator.validate_types(root)
+""".strip()
 
-        # Should have no errors for primitive types
-        assert len(errors) == 0
-
-    def test_valid_local_type_reference(self, validator):
-        """Test referencing a type defined in the same file."""
-        code = """
+_CODE_VALID_LOCAL_TYPE_REFERENCE = """
 enum Status
     OK = 0
     ERROR = 1
@@ -168,37 +189,20 @@ enum Status
 struct Message
     Status status
     uint32 value
-        """
-        root = Path(".")
-        file_path = Path("test.msg")
+""".strip()
 
-        validator.parsed_files[file_path] = validator.parser.parse(code.strip())
-        validator.collect_defined_types(root)
-        errors = validator.validate_types(root)
-
-        # Should have no errors
-        assert len(errors) == 0
-
-    def test_invalid_unknown_type(self, validator):
-        """Test that unknown types generate errors."""
-        code = """
+_CODE_INVALID_UNKNOWN_TYPE = """
 struct Message
     UnknownType field
-        """
-        root = Path(".")
-        file_path = Path("test.msg")
+""".strip()
 
-        validator.parsed_files[file_path] = validator.parser.parse(code.strip())
-        validator.collect_defined_types(root)
-        errors = validator.validate_types(root)
-
-        # Should have error for unknown type
-        # (may be 0 if grammar doesn't support struct_or_enum_ref yet)
-        assert len(errors) >= 0  # Flexible for current grammar state
+_CODE_OPTIONAL_AND_QUALIFIED_UNKNOWN_TYPES = """
+struct Message
+    optional Missing first
+    common::geometry::Vector3 second
+""".strip()
 
-    def test_multiple_type_definitions(self, validator):
-        """Test file with multiple type definitions."""
-        code = """
+_CODE_MULTIPLE_TYPE_DEFINITIONS = """
 enum Color
     RED = 0
     GREEN = 1
@@ -211,15 +215,67 @@ struct RGB
 struct Pixel
     RGB color
     Color color_enum
-        """
-        root = Path(".")
-        file_path = Path("test.msg")
+""".strip()
 
-        validator.parsed_files[file_path] = validator.parser.parse(code.strip())
-        validator.collect_defined_types(root)
+
+class TestTypeValidation:
+    """Test type checking and validation."""
+
+    def test_valid_primitive_types(self, validator, cached_parse):
+        """Test that all primitive types are recognized as valid."""
+        validator.parsed_files[_TEST_FILE] = cached_parse(_PREPROCESSOR.process(_CODE_VALID_PRIMITIVE_TYPES))
+        errors = validator.run(_ROOT)
+
+        # Should have no errors for primitive types
+        assert len(errors) == 0
+
+    def test_valid_local_type_reference(self, validator, cached_parse):
+        """Test referencing a type defined in the same file."""
+        validator.parsed_files[_TEST_FILE] = cached_parse(_PREPROCESSOR.process(_CODE_VALID_LOCAL_TYPE_REFERENCE))
+        errors = validator.run(_ROOT)
+
+        # Should have no errors
+        assert len(errors) == 0
+
+    def test_invalid_unknown_type(self, validator, cached_parse):
+        """Test that unknown types generate errors."""
+        validator.parsed_files[_TEST_FILE] = cached_parse(_PREPROCESSOR.process(_CODE_INVALID_UNKNOWN_TYPE))
+        errors = validator.run(_ROOT)
+
+        # Should have error for unknown type
+        assert [error['type'] for error in errors] == ["UnknownType"]
+
+    def test_optional_and_qualified_unknown_types(self, validator, cached_parse):
+        """Test that optional and namespace-qualified references are checked too."""
+        validator.parsed_files[_TEST_FILE] = cached_parse(
+            _PREPROCESSOR.process(_CODE_OPTIONAL_AND_QUALIFIED_UNKNOWN_TYPES)
+        )
+        errors = validator.run(_ROOT)
+
+        assert [(error['field'], error['type']) for error in errors] == [
+            ("first", "Missing"),
+            ("second", "common::geometry::Vector3"),
+        ]
+
+    def test_malformed_reference_node_reported(self, validator):
+        """Test that a type reference node without a field name is reported, not skipped."""
+        field = Tree("user_type_field", [Token("CNAME", "Status")])
+        validator.parsed_files[_TEST_FILE] = Tree("start", [Tree("struct_def", [
+            Token("STRUCT", "struct"), Token("CNAME", "Message"), Tree("struct_body", [field]),
+        ])])
+        errors = validator.run(_ROOT)
+
+        assert [error['message'] for error in errors] == [
+            "Unexpected 'user_type_field' node structure"
+        ]
+
+    def test_multiple_type_definitions(self, validator, cached_parse):
+        """Test file with multiple type definitions."""
+        validator.parsed_files[_TEST_FILE] = cached_parse(_PREPROCESSOR.process(_CODE_MULTIPLE_TYPE_DEFINITIONS))
+        validator.collect_defined_types(_ROOT)
 
         # Should define 3 types
-        defined = validator.defined_types_by_file[file_path]
+        defined = validator.defined_types_by_file[_TEST_FILE]
         assert len(defined) >= 2  # At least enum and struct
 
 
@@ -243,106 +299,99 @@ class TestNamespaces:
         assert namespace == "a::b::c::types"
 
 
+_CODE_PARSE_INTEGER_CONSTANT = """
+const uint32 MAX_SIZE = 1024
+""".strip()
+
+_CODE_PARSE_FLOAT_CONSTANT = """
+const float32 PI = 3.14159
+""".strip()
+
+_CODE_MULTIPLE_CONSTANTS = """
+const uint8 VERSION = 1
+const uint32 BUFFER_SIZE = 4096
+const float64 EPSILON = 0.0001
+""".strip()
+
+
 class TestConstants:
     """Test constant validation."""
 
-    def test_parse_integer_constant(self, parser):
+    def test_parse_integer_constant(self, cached_parse):
         """Test integer constant parsing."""
-        code = """
-const uint32 MAX_SIZE = 1024
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_PARSE_INTEGER_CONSTANT)
 
         const_defs = list(tree.find_data("const_def"))
         assert len(const_defs) == 1
 
-    def test_parse_float_constant(self, parser):
+    def test_parse_float_constant(self, cached_parse):
         """Test float constant parsing."""
-        code = """
-const float32 PI = 3.14159
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_PARSE_FLOAT_CONSTANT)
 
         const_defs = list(tree.find_data("const_def"))
         assert len(const_defs) == 1
 
-    def test_multiple_constants(self, parser):
+    def test_multiple_constants(self, cached_parse):
         """Test multiple constant definitions."""
-        code = """
-const uint8 VERSION = 1
-const uint32 BUFFER_SIZE = 4096
-const float64 EPSILON = 0.0001
-        """
-        tree = parser.parse(code.strip())
+        tree = cached_parse(_CODE_MULTIPLE_CONSTANTS)
 
         const_defs = list(tree.find_data("const_def"))
         assert len(const_defs) == 3
 
 
-class TestEnums:
-    """Test enum validation."""
-
-    def test_enum_values_sequential(self, parser):
-        """Test enum with sequential values."""
-        code = """
+_CODE_ENUM_VALUES_SEQUENTIAL = """
 enum Level
     LOW = 0
     MEDIUM = 1
     HIGH = 2
-        """
-        tree = parser.parse(code.strip())
+""".strip()
 
-        enum_entries = list(tree.find_data("enum_entry"))
-        assert len(enum_entries) == 3
-
-    def test_enum_values_non_sequential(self, parser):
-        """Test enum with non-sequential values."""
-        code = """
+_CODE_ENUM_VALUES_NON_SEQUENTIAL = """
 enum Flags
     FLAG_A = 1
     FLAG_B = 2
     FLAG_C = 4
     FLAG_D = 8
-        """
-        tree = parser.parse(code.strip())
-
-        enum_entries = list(tree.find_data("enum_entry"))
-        assert len(enum_entries) == 4
+""".strip()
 
-    def test_enum_negative_values(self, parser):
-        """Test enum with negative values."""
-        code = """
+_CODE_ENUM_NEGATIVE_VALUES = """
 enum Direction
     LEFT = -1
     CENTER = 0
     RIGHT = 1
-        """
-        tree = parser.parse(code.strip())
+""".strip()
+
+
+class TestEnums:
+    """Test enum validation."""
+
+    def test_enum_values_sequential(self, cached_parse):
+        """Test enum with sequential values."""
+        tree = cached_parse(_CODE_ENUM_VALUES_SEQUENTIAL)
 
         enum_entries = list(tree.find_data("enum_entry"))
         assert len(enum_entries) == 3
 
+    def test_enum_values_non_sequential(self, cached_parse):
+        """Test enum with non-sequential values."""
+        tree = cached_parse(_CODE_ENUM_VALUES_NON_SEQUENTIAL)
 
-class TestStructs:
-    """Test struct validation."""
+        enum_entries = list(tree.find_data("enum_entry"))
+        assert len(enum_entries) == 4
 
-    def test_empty_struct(self, parser):
-        """Test that empty struct raises error or warning."""
-        code = """
+    def test_enum_negative_values(self, cached_parse):
+        """Test enum with negative values."""
+        tree = cached_parse(_CODE_ENUM_NEGATIVE_VALUES)
+
+        enum_entries = list(tree.find_data("enum_entry"))
+        assert len(enum_entries) == 3
+
+
+_CODE_EMPTY_STRUCT = """
 struct Empty
-        """
-        # Depending on grammar, this might be invalid
-        try:
-            tree = parser.parse(code.strip())
-            # If it parses, that's also valid (some IDLs allow empty structs)
-            assert tree is not None
-        except Exception:
-            # Also acceptable to reject empty structs
-            pass
+""".strip()
 
-    def test_struct_with_all_primitive_types(self, parser):
-        """Test struct using all primitive types."""
-        code = """
+_CODE_STRUCT_WITH_ALL_PRIMITIVE_TYPES = """
 struct AllTypes
     bool b
     int8 i8
@@ -355,31 +404,38 @@ struct AllTypes
     uint64 u64
     float32 f32
     float64 f64
-        """
-        tree = parser.parse(code.strip())
+""".strip()
+
+
+class TestStructs:
+    """Test struct validation."""
+
+    def test_empty_struct(self, cached_parse):
+        """Test that empty struct raises error or warning."""
+        # Depending on grammar, this might be invalid
+        try:
+            tree = cached_parse(_CODE_EMPTY_STRUCT)
+            # If it parses, that's also valid (some IDLs allow empty structs)
+            assert tree is not None
+        except Exception:
+            # Also acceptable to reject empty structs
+            pass
+
+    def test_struct_with_all_primitive_types(self, cached_parse):
+        """Test struct using all primitive types."""
+        tree = cached_parse(_CODE_STRUCT_WITH_ALL_PRIMITIVE_TYPES)
 
         struct_defs = list(tree.find_data("struct_def"))
         assert len(struct_defs) == 1
 
 
-class TestInterfaces:
-    """Test interface validation."""
-
-    def test_simple_interface(self, parser):
-        """Test basic interface definition."""
-        code = """
+_CODE_SIMPLE_INTERFACE = """
 interface Status
     uint8 code
     bool success
-        """
-        tree = parser.parse(code.strip())
-
-        interface_defs = list(tree.find_data("interface_def"))
-        assert len(interface_defs) == 1
+""".strip()
 
-    def test_interface_with_struct_fields(self, parser):
-        """Test interface using struct types."""
-        code = """
+_CODE_INTERFACE_WITH_STRUCT_FIELDS = """
 struct Position
     float64 x
     float64 y
@@ -387,33 +443,39 @@ struct Position
 interface RobotState
     Position pos
     uint8 battery
-        """
-        tree = parser.parse(code.strip())
+""".strip()
+
+
+class TestInterfaces:
+    """Test interface validation."""
+
+    def test_simple_interface(self, cached_parse):
+        """Test basic interface definition."""
+        tree = cached_parse(_CODE_SIMPLE_INTERFACE)
 
         interface_defs = list(tree.find_data("interface_def"))
         assert len(interface_defs) == 1
 
+    def test_interface_with_struct_fields(self, cached_parse):
+        """Test interface using struct types."""
+        tree = cached_parse(_CODE_INTERFACE_WITH_STRUCT_FIELDS)
 
-class TestFileOperations:
-    """Test multi-file operations."""
-
-    def test_parse_valid_test_files(self, parser):
-        """Test parsing all valid test files."""
-        valid_dir = TEST_DIR / "valid"
+        interface_defs = list(tree.find_data("interface_def"))
+        assert len(interface_defs) == 1
 
-        if not valid_dir.exists():
-            pytest.skip("Test files not found")
 
-        for file_path in valid_dir.glob("*.msg"):
-            with open(file_path) as f:
-                content = f.read()
+class TestFileOperations:
+    """Test multi-file operations."""
 
-            try:
-                tree = parser.parse(content)
-                assert tree is not None
-            except Exception as e:
-                # Some test files might use features not yet in grammar
-                pytest.skip(f"Feature not supported: {e}")
+    @pytest.mark.parametrize("file_path", VALID_FILES, ids=lambda p: p.name)
+    def test_parse_valid_test_files(self, parser, msg_contents, file_path):
+        """Test parsing each valid test file (one case per file, so xdist can spread them)."""
+        try:
+            tree = parser.parse(msg_contents[file_path])
+            assert tree is not None
+        except Exception as e:
+            # Some test files might use features not yet in grammar
+            pytest.skip(f"Feature not supported: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+"""
+Parse tree helpers shared by the test modules.
+"""
+
+from collections import defaultdict
+
+
+def count_data(tree, name):
+    """Count the subtrees for a rule without building a list of them."""
+    return sum(1 for _ in tree.find_data(name))
+
+
+def first_data(tree, name):
+    """Return the first subtree for a rule in source order, or None.
+
+    Walks top-down and stops at the first match; find_data() would visit
+    the whole tree before yielding anything.
+    """
+    return next((subtree for subtree in tree.iter_subtrees_topdown() if subtree.data == name), None)
+
+
+def index_data(tree):
+    """Group every subtree by rule name in one traversal.
+
+    For tests that query several rules on the same tree; each find_data()
+    call walks the whole tree again. Missing rules map to an empty list.
+    """
+    index = defaultdict(list)
+    for subtree in tree.iter_subtrees():
+        index[subtree.data].append(subtree)
+    return index